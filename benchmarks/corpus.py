@@ -0,0 +1,83 @@
+import os
+import random
+
+# Common English words the corpus is built from. Misspellings are made by mutating
+# them, so the ratio of misspelled words is controlled by the caller.
+WORDS = (
+    "the of and to in is was that for it as with be on not he by this are or his from "
+    "at which but have an they you were her she there one all we their can has more "
+    "been would if will other when who some them what so time its into only new about "
+    "than two may first any these also people over could made like after such many "
+    "between year state most work through well where then world should before because "
+    "system number those both part place under small large around found during without "
+    "water each government school another while public general however might great "
+    "point country market family history different example program question interest "
+    "information development always problem through house letter report building editor "
+    "document window highlight spelling character paragraph sentence language measure"
+).split()
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def _misspell(word, rng):
+    # One random edit (deletion, transposition, replacement or insertion). Short words
+    # get an insertion so they do not collapse into another common word.
+    if len(word) < 4:
+        i = rng.randrange(len(word) + 1)
+        return word[:i] + rng.choice(LETTERS) + rng.choice(LETTERS) + word[i:]
+    i = rng.randrange(len(word) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return word[:i] + word[i + 1:]
+    if kind == 1:
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == 2:
+        return word[:i] + rng.choice(LETTERS.replace(word[i], "")) + word[i + 1:]
+    return word[:i] + rng.choice(LETTERS) + word[i:]
+
+
+def iter_corpus_lines(size, misspelling_density=0.02, line_length=80, space_run_density=0.01, seed=0):
+    # Yields "\n"-terminated lines of roughly line_length characters until about size
+    # bytes have been produced. misspelling_density is the fraction of words that are
+    # misspelled; space_run_density the fraction of word gaps that are a run of 2-4
+    # spaces instead of one (for the whitespace commands).
+    rng = random.Random(seed)
+    produced = 0
+    while produced < size:
+        words = []
+        length = 0
+        while length < line_length:
+            word = rng.choice(WORDS)
+            if rng.random() < misspelling_density:
+                word = _misspell(word, rng)
+            gap = " " * rng.randint(2, 4) if rng.random() < space_run_density else " "
+            words.append(word + gap)
+            length += len(word) + len(gap)
+        line = "".join(words).rstrip(" ") + "\n"
+        produced += len(line)
+        yield line
+
+
+def generate_corpus(size, **options):
+    # The whole corpus as one string; see iter_corpus_lines for the options.
+    return "".join(iter_corpus_lines(size, **options))
+
+
+def write_corpus(path, size, **options):
+    # Streams a corpus to path without holding it in memory (for the 100 MB sizes).
+    with open(path, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+        for line in iter_corpus_lines(size, **options):
+            f.write(line)
+    return os.path.getsize(path)
+
+
+def corpus_path(directory, size, misspelling_density=0.02, line_length=80, space_run_density=0.01, seed=0):
+    # Generated files are named by their parameters and reused across runs.
+    name = f"corpus-{size}-m{misspelling_density}-l{line_length}-s{space_run_density}-r{seed}.txt"
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        temp_path = path + ".tmp"
+        write_corpus(temp_path, size, misspelling_density=misspelling_density, line_length=line_length,
+                     space_run_density=space_run_density, seed=seed)
+        os.replace(temp_path, path)
+    return path
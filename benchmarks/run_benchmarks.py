@@ -0,0 +1,244 @@
+"""Benchmarks for the editor's hot paths on generated corpora.
+
+Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --sizes 10K,1M,10M --output results.json
+
+Each (case, size) pair runs in a fresh subprocess so its peak RSS is its own. Cases run
+against a hidden TextEditor when Tk and a display are available, and otherwise against
+a plain-string model built from the same utils functions the editor uses ("model"
+backend). Results are written as JSON so runs can be compared across commits. Each
+result that fell back to the model records why in "fallback_reason".
+
+On a machine without a display, run the editor itself under a virtual one and ask for
+the Tk backend explicitly, so a missing display is an error rather than a fallback:
+
+    xvfb-run -a python -m benchmarks.run_benchmarks --backend tk --sizes 10K,1M
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import corpus_path
+from utils import instrumentation
+
+CASES = ("open_file", "spell_check", "highlight_spaces", "delete_all_spaces", "delete_spaces_in_selected_lines")
+DEFAULT_SIZES = "10K,100K,1M,10M"
+SIZE_UNITS = {"K": 1024, "M": 1024 * 1024, "G": 1024 * 1024 * 1024}
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_size(text):
+    # "10K", "100M" or a plain byte count
+    text = text.strip().upper()
+    if text[-1:] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+
+def _selected_line_range(line_count):
+    # The middle third of the document stands in for a user's selection.
+    first = max(line_count // 3, 1)
+    return first, max(2 * line_count // 3, first)
+
+
+class ModelBackend:
+    # The editor's operations on a plain string, using the same utils code paths. Tag
+    # counts are the number of ranges the editor would tag.
+    name = "model"
+
+    def __init__(self):
+        from utils.spell_checker import SpellCheckerUtil
+        self.spell_checker_util = SpellCheckerUtil()
+        self.content = ""
+
+    def load(self, path):
+        from utils.file_io import ChunkedFileLoader
+        self.content = "".join(text for text, _ in ChunkedFileLoader(path).iter_chunks())
+
+    def run(self, case, path):
+        from utils.spell_engine import check_text
+        from utils.whitespace import delete_runs, find_whitespace_runs
+
+        if case == "open_file":
+            self.load(path)
+            return {"tags": 0}
+        if case == "spell_check":
+            return {"tags": len(check_text(self.content, self.spell_checker_util))}
+        if case == "highlight_spaces":
+            return {"tags": len(find_whitespace_runs(self.content, "spaces"))}
+        if case == "delete_all_spaces":
+            runs = find_whitespace_runs(self.content, "spaces")
+            self.content = delete_runs(self.content, runs)
+            return {"tags": 0, "runs": len(runs)}
+        # delete_spaces_in_selected_lines
+        lines = self.content.split("\n")
+        first, last = _selected_line_range(len(lines))
+        selected = "\n".join(lines[first - 1:last])
+        runs = find_whitespace_runs(selected, "spaces", first)
+        lines[first - 1:last] = delete_runs(selected, runs, first).split("\n")
+        self.content = "\n".join(lines)
+        return {"tags": 0, "runs": len(runs)}
+
+
+class TkBackend:
+    # Drives a withdrawn TextEditor. Raises ImportError or TclError when the editor or
+    # a display is not available, and the harness falls back to ModelBackend.
+    name = "tk"
+
+    def __init__(self):
+        import tkinter as tk
+        from ui import editor
+        from utils.spell_checker import SpellCheckerUtil
+        # Informational message boxes would wait for a click
+        editor.messagebox.showinfo = lambda *args, **kwargs: None
+        self.tk = tk
+        self.editor = editor.TextEditor()
+        self.editor.withdraw()
+        self.editor.spell_checker_util = SpellCheckerUtil()
+
+    def _wait_until(self, done):
+        while not done():
+            self.editor.update()
+            time.sleep(0.001)
+
+    def _tag_count(self, tag):
+        return len(self.editor.document.text_area.tag_ranges(tag)) // 2
+
+    def load(self, path):
+        self.editor.open_file(path)
+        self._wait_until(lambda: self.editor.document.file_loader is None)
+
+    def run(self, case, path):
+        editor = self.editor
+        if case == "open_file":
+            self.load(path)
+            return {"tags": 0}
+        if case == "spell_check":
+            editor.spell_check_text()
+            self._wait_until(lambda: editor.document.spell_check_job is None)
+            return {"tags": self._tag_count("misspelled")}
+        if case == "highlight_spaces":
+            editor.highlight_spaces_active.set(True)
+            editor.toggle_highlight_spaces()
+            editor.update_idletasks()
+            return {"tags": self._tag_count("space")}
+        if case == "delete_all_spaces":
+            editor.delete_all_spaces()
+            editor.update_idletasks()
+            return {"tags": 0}
+        # delete_spaces_in_selected_lines
+        line_count = int(editor.document.text_area.index("end-1c").split('.')[0])
+        first, last = _selected_line_range(line_count)
+        editor.document.text_area.tag_add(self.tk.SEL, f"{first}.0", f"{last}.end")
+        editor.delete_spaces_in_selected_lines()
+        editor.update_idletasks()
+        return {"tags": 0}
+
+
+def make_backend(name):
+    if name in ("auto", "tk"):
+        try:
+            return TkBackend(), None
+        except Exception as e: # No display, no Tk, or the editor failed to import
+            if name == "tk":
+                raise
+            return ModelBackend(), f"{type(e).__name__}: {e}"
+    return ModelBackend(), None
+
+
+def run_single(case, path, backend_name):
+    # One measurement in this process; returns the result dict.
+    backend, fallback_reason = make_backend(backend_name)
+    if case != "open_file":
+        backend.load(path)
+    start = time.perf_counter()
+    result = backend.run(case, path)
+    seconds = time.perf_counter() - start
+    result.update({
+        "case": case,
+        "backend": backend.name,
+        "bytes": os.path.getsize(path),
+        "seconds": seconds,
+        "peak_rss": instrumentation.peak_rss_bytes(),
+    })
+    if fallback_reason:
+        result["fallback_reason"] = fallback_reason
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the editor's hot paths on generated corpora.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"comma-separated corpus sizes (default {DEFAULT_SIZES}; up to e.g. 100M)")
+    parser.add_argument("--cases", default=",".join(CASES), help="comma-separated cases to run")
+    parser.add_argument("--misspelling-density", type=float, default=0.02, help="fraction of words misspelled")
+    parser.add_argument("--line-length", type=int, default=80, help="approximate characters per line")
+    parser.add_argument("--space-run-density", type=float, default=0.01, help="fraction of word gaps that are runs of spaces")
+    parser.add_argument("--backend", choices=("auto", "tk", "model"), default="auto")
+    parser.add_argument("--corpus-dir", default=os.path.join(tempfile.gettempdir(), "texteditor-benchmarks"))
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--single", nargs=2, metavar=("CASE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single: # Child process: one measurement, printed as JSON
+        print(json.dumps(run_single(args.single[0], args.single[1], args.backend)))
+        return 0
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))} (choose from {', '.join(CASES)})")
+
+    results = []
+    for size_text in args.sizes.split(","):
+        size = parse_size(size_text)
+        path = corpus_path(args.corpus_dir, size, misspelling_density=args.misspelling_density,
+                           line_length=args.line_length, space_run_density=args.space_run_density)
+        for case in cases:
+            completed = subprocess.run(
+                [sys.executable, "-m", "benchmarks.run_benchmarks", "--backend", args.backend, "--single", case, path],
+                cwd=REPO_ROOT, capture_output=True, text=True)
+            if completed.returncode != 0:
+                result = {"case": case, "bytes": os.path.getsize(path), "error": completed.stderr.strip().splitlines()[-1:]}
+            else:
+                result = json.loads(completed.stdout.strip().splitlines()[-1])
+            result["size"] = size_text.strip()
+            results.append(result)
+            print(f"{case} {size_text.strip()}: {result.get('seconds', float('nan')):.3f}s", file=sys.stderr)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {
+            "misspelling_density": args.misspelling_density,
+            "line_length": args.line_length,
+            "space_run_density": args.space_run_density,
+            "backend": args.backend,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
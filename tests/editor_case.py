@@ -0,0 +1,63 @@
+import os
+import tempfile
+import time
+import unittest
+
+from utils.spell_checker import SpellCheckerUtil
+
+try:
+    import tkinter as tk
+    from ui.editor import TextEditor
+except ImportError: # Python built without Tk
+    tk = None
+
+# Longest a spell check or file load may take before a test gives up on it
+TIMEOUT = 30
+
+
+class EditorTestCase(unittest.TestCase):
+    # Base class for tests that drive a withdrawn editor window. Needs a display (e.g.
+    # run under xvfb-run on CI); skipped without one. Each test gets its own user
+    # dictionary; the compiled dictionary is shared by the tests of a class.
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls.temp_dir.cleanup)
+
+    def setUp(self):
+        if tk is None:
+            self.skipTest("tkinter is not available")
+        try:
+            self.editor = TextEditor()
+        except tk.TclError as e:
+            self.skipTest(f"Tk is not available: {e}")
+        self.addCleanup(self.editor.destroy)
+        self.editor.withdraw()
+        self.editor.spell_checker_util = SpellCheckerUtil(
+            cache_dir=self.temp_dir.name, user_dictionary_path=os.path.join(self.temp_dir.name, f"{self.id()}.txt"))
+
+    def wait_until(self, condition, what):
+        # Runs the Tk event loop until condition() holds
+        deadline = time.monotonic() + TIMEOUT
+        while not condition():
+            self.assertLess(time.monotonic(), deadline, f"{what} did not finish")
+            self.editor.update()
+            time.sleep(0.01)
+
+    def run_spell_check(self):
+        self.editor.spell_check_text()
+        self.wait_for_spell_check()
+
+    def wait_for_spell_check(self):
+        self.wait_until(lambda: self.editor.document.spell_check_job is None, "spell check")
+
+    def open_file(self, path):
+        self.editor.open_file(path)
+        self.wait_until(lambda: self.editor.document.file_loader is None, "file load")
+
+    def text(self):
+        return self.editor.document.text_area.get("1.0", "end-1c")
+
+    def tagged_words(self, tag="misspelled"):
+        ranges = self.editor.document.text_area.tag_ranges(tag)
+        return [self.editor.document.text_area.get(start, end) for start, end in zip(ranges[::2], ranges[1::2])]
@@ -0,0 +1,83 @@
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from utils import batch
+from utils.file_io import ChunkedFileLoader
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = temp_dir.name
+
+    def write(self, name, data):
+        path = os.path.join(self.dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+
+class NewlineTest(TempDirTestCase):
+    def test_loader_translates_and_counts_line_endings(self):
+        data = "é\r\n" * 100 + "x\n"
+        path = self.write("a.txt", data.encode("utf-8"))
+        for chunk_size in (1, 2, 3, 64):
+            loader = ChunkedFileLoader(path, chunk_size=chunk_size, first_chunk_size=chunk_size)
+            text = "".join(text for text, _ in loader.iter_chunks())
+            self.assertEqual(text, data.replace("\r\n", "\n"))
+            self.assertEqual(loader.newline_counts, {"\n": 1, "\r\n": 100, "\r": 0})
+            self.assertEqual(loader.newline, "\r\n")
+
+    def test_loader_newline_defaults_to_lf(self):
+        loader = ChunkedFileLoader(self.write("a.txt", b"one line"))
+        list(loader.iter_chunks())
+        self.assertEqual(loader.newline, "\n")
+
+    def test_strip_keeps_line_endings(self):
+        for newline in (b"\n", b"\r\n", b"\r"):
+            path = self.write("a.txt", b"a  b " + newline + b"c d" + newline)
+            result = batch.strip_file(path, mode="trailing")
+            self.assertEqual(result["runs"], 1)
+            self.assertEqual(self.read(path), b"a  b" + newline + b"c d" + newline)
+
+
+class StripSpacesCommandTest(TempDirTestCase):
+    def run_command(self, *argv):
+        parser = argparse.ArgumentParser()
+        batch.add_arguments(parser.add_subparsers(dest="command"))
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            return batch.run_command(parser.parse_args(["strip-spaces", "--jobs", "1", *argv]))
+
+    def test_default_mode_only_strips_trailing_whitespace(self):
+        path = self.write("a.txt", b"keep  these words \n")
+        self.assertEqual(self.run_command(self.dir), 0)
+        self.assertEqual(self.read(path), b"keep  these words\n")
+
+    def test_dry_run_leaves_files_alone(self):
+        path = self.write("a.txt", b"a b \n")
+        self.assertEqual(self.run_command("--dry-run", self.dir), 1)
+        self.assertEqual(self.read(path), b"a b \n")
+
+    def test_jobs_must_be_positive(self):
+        for jobs in ("0", "-2", "x"):
+            with self.subTest(jobs=jobs), self.assertRaises(SystemExit) as raised:
+                self.run_command("--jobs", jobs, self.dir)
+            self.assertEqual(raised.exception.code, 2) # argparse usage error
+
+    def test_spaces_mode(self):
+        path = self.write("a.md", b"a  b c\n")
+        self.assertEqual(self.run_command("--mode", "spaces", self.dir), 0)
+        self.assertEqual(self.read(path), b"abc\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
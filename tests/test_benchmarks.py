@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks import corpus
+from benchmarks import run_benchmarks
+from utils.spell_checker import WORD_PATTERN
+from utils.whitespace import find_whitespace_runs
+
+
+class CorpusTest(unittest.TestCase):
+    def test_size_and_line_length(self):
+        text = corpus.generate_corpus(10000, line_length=40)
+        self.assertGreaterEqual(len(text), 10000)
+        self.assertLess(len(text), 10000 + 100)
+        lines = text.split("\n")[:-1]
+        self.assertTrue(all(30 <= len(line) <= 60 for line in lines))
+
+    def test_same_seed_same_corpus(self):
+        self.assertEqual(corpus.generate_corpus(5000, seed=3), corpus.generate_corpus(5000, seed=3))
+        self.assertNotEqual(corpus.generate_corpus(5000, seed=3), corpus.generate_corpus(5000, seed=4))
+
+    def test_densities(self):
+        clean = corpus.generate_corpus(20000, misspelling_density=0, space_run_density=0)
+        self.assertTrue(set(WORD_PATTERN.findall(clean)) <= set(corpus.WORDS))
+        self.assertTrue(all(end - start == 1 for _, start, end in find_whitespace_runs(clean, "spaces")))
+        noisy = corpus.generate_corpus(20000, misspelling_density=0.5, space_run_density=0.5)
+        self.assertFalse(set(WORD_PATTERN.findall(noisy)) <= set(corpus.WORDS))
+        self.assertTrue(any(end - start > 1 for _, start, end in find_whitespace_runs(noisy, "spaces")))
+
+    def test_corpus_path_is_reused(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = corpus.corpus_path(directory, 4096)
+            mtime = os.path.getmtime(path)
+            self.assertEqual(corpus.corpus_path(directory, 4096), path)
+            self.assertEqual(os.path.getmtime(path), mtime)
+            self.assertNotEqual(corpus.corpus_path(directory, 4096, seed=1), path)
+
+
+class RunBenchmarksTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls.temp_dir.cleanup)
+        cls.path = corpus.corpus_path(cls.temp_dir.name, 20000, space_run_density=0.1)
+
+    def test_parse_size(self):
+        self.assertEqual(run_benchmarks.parse_size("10K"), 10 * 1024)
+        self.assertEqual(run_benchmarks.parse_size("1.5m"), 1536 * 1024)
+        self.assertEqual(run_benchmarks.parse_size("123"), 123)
+
+    def test_model_backend_cases(self):
+        for case in run_benchmarks.CASES:
+            result = run_benchmarks.run_single(case, self.path, "model")
+            self.assertEqual(result["case"], case)
+            self.assertEqual(result["backend"], "model")
+            self.assertEqual(result["bytes"], os.path.getsize(self.path))
+            self.assertGreaterEqual(result["seconds"], 0)
+            self.assertNotIn("fallback_reason", result)
+
+    def test_model_backend_results(self):
+        backend = run_benchmarks.ModelBackend()
+        backend.load(self.path)
+        runs = len(find_whitespace_runs(backend.content, "spaces"))
+        self.assertEqual(backend.run("highlight_spaces", self.path), {"tags": runs})
+        self.assertGreater(backend.run("spell_check", self.path)["tags"], 0)
+        self.assertEqual(backend.run("delete_all_spaces", self.path)["runs"], runs)
+        self.assertNotIn(" ", backend.content)
+
+    def test_auto_backend_reports_fallback(self):
+        # Tk when a display is available, otherwise the model with the reason recorded
+        result = run_benchmarks.run_single("open_file", self.path, "auto")
+        self.assertEqual(result["backend"] == "model", "fallback_reason" in result)
+
+
+if __name__ == "__main__":
+    unittest.main()
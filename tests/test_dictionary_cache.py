@@ -0,0 +1,69 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from utils.dictionary_cache import CompiledDictionary, build_dictionary, load_dictionary
+
+
+class LoadDictionaryTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.dir = temp_dir.name
+        self.path = os.path.join(self.dir, "en.dict")
+
+    def load(self):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            dictionary = load_dictionary("en", self.dir)
+        self.addCleanup(dictionary.close)
+        return dictionary, stdout.getvalue(), stderr.getvalue()
+
+    def test_corrupt_cache_is_rebuilt_with_a_message_on_stderr(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a dictionary" * 4)
+        dictionary, stdout, stderr = self.load()
+        self.assertIn("hello", dictionary)
+        self.assertEqual(stdout, "") # The check command writes JSON lines there
+        self.assertIn("Rebuilding dictionary cache", stderr)
+
+    def test_truncated_cache_is_rebuilt(self):
+        load_dictionary("en", self.dir).close()
+        with open(self.path, "r+b") as f:
+            f.truncate(30)
+        dictionary, stdout, stderr = self.load()
+        self.assertIn("hello", dictionary)
+        self.assertIn("truncated", stderr)
+
+
+class CompiledDictionaryTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = os.path.join(temp_dir.name, "words.dict")
+
+    def test_lookup(self):
+        build_dictionary(self.path, {"hello": 5, "café": 2}, source="test")
+        dictionary = CompiledDictionary(self.path)
+        self.addCleanup(dictionary.close)
+        self.assertEqual(dictionary.frequency("hello"), 5)
+        self.assertEqual(dictionary.frequency("café"), 2)
+        self.assertEqual(dictionary.frequency("qwzxv"), 0)
+        self.assertEqual(len(dictionary), 2)
+        self.assertEqual(dictionary.source, "test")
+
+    def test_truncated_file(self):
+        build_dictionary(self.path, {"hello": 5, "café": 2})
+        size = os.path.getsize(self.path)
+        for length in (30, size // 2):
+            with self.subTest(length=length):
+                with open(self.path, "r+b") as f:
+                    f.truncate(length)
+                with self.assertRaises(ValueError):
+                    CompiledDictionary(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
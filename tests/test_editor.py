@@ -0,0 +1,117 @@
+import os
+import unittest
+from unittest import mock
+
+from tests.editor_case import EditorTestCase
+from tests.test_tokenizers import HTML_DOCUMENT
+from utils.tokenizers import html_prose_spans
+
+
+class TagMisspellingsTest(EditorTestCase):
+    def test_html_window_reads_like_the_full_document(self):
+        self.editor.document.text_area.insert("1.0", HTML_DOCUMENT)
+        self.editor.document.tokenizer = html_prose_spans
+        self.editor._tag_misspellings(6, 9) # Starts inside <style>, ends inside <script>
+        self.assertEqual(self.tagged_words(), [])
+        self.editor._tag_misspellings(13, 14) # Inside the <p ...> tag, then its text
+        self.assertEqual(self.tagged_words(), ["Helo", "wrold"])
+
+
+class ViewportHighlightingTest(EditorTestCase):
+    def test_resolved_misspellings_stay_untagged_after_scrolling(self):
+        text_area = self.editor.document.text_area
+        text_area.insert("1.0", "qwzxv here\n" + "fine words\n" * 500 + "qwzxv there\n")
+        self.run_spell_check()
+        self.editor.spell_panel.on_ignore_once() # The first qwzxv
+        self.editor.viewport_highlighting.set(True)
+        self.editor.toggle_viewport_highlighting()
+        self.assertEqual(self.tagged_words(), []) # Line 1 was ignored, line 502 is not in view
+
+        text_area.see("end")
+        self.editor.update_idletasks()
+        self.editor._refresh_viewport_highlights()
+        self.assertEqual(text_area.index("misspelled.first"), "502.0")
+
+        text_area.see("1.0")
+        self.editor.update_idletasks()
+        self.editor._refresh_viewport_highlights()
+        self.assertEqual(self.tagged_words(), [])
+
+    def test_scans_without_a_check(self):
+        self.editor.document.text_area.insert("1.0", "qwzxv here\n")
+        self.editor.document.misspelling_highlights_active = True # As check as you type sets it
+        self.editor.viewport_highlighting.set(True)
+        self.editor.toggle_viewport_highlighting()
+        self.assertEqual(self.tagged_words(), ["qwzxv"])
+
+
+class EditMenuTest(EditorTestCase):
+    def state(self, label):
+        return str(self.editor.edit_menu.entrycget(label, "state"))
+
+    def test_editing_commands_are_disabled_while_a_check_runs(self):
+        self.editor.document.text_area.insert("1.0", "a  b qwzxv\n")
+        self.editor.spell_check_text()
+        self.assertEqual(self.state("Delete All Spaces in Document"), "disabled")
+        self.assertEqual(self.state("Cancel Spell Check"), "normal")
+        self.wait_for_spell_check()
+        self.assertEqual(self.state("Delete All Spaces in Document"), "normal")
+        self.assertEqual(self.state("Delete Spaces in Selected Lines"), "normal")
+        self.assertEqual(self.state("Cancel Spell Check"), "disabled")
+
+
+class OpenFileTest(EditorTestCase):
+    @mock.patch("ui.editor.messagebox")
+    def test_missing_file(self, messagebox):
+        self.editor.open_file(os.path.join(self.temp_dir.name, "missing.txt"))
+        messagebox.showerror.assert_called_once()
+
+    @mock.patch("ui.editor.messagebox")
+    def test_decode_error_partway_through(self, messagebox):
+        path = os.path.join(self.temp_dir.name, f"{self.id()}.txt")
+        with open(path, "wb") as f:
+            f.write(b"fine\n" * 100000 + b"\xff\n")
+        self.open_file(path)
+        messagebox.showerror.assert_called_once()
+        self.assertEqual(self.editor.document.text_area.get("1.0", "end-1c"), "")
+        self.assertIsNone(self.editor.document.filepath)
+
+
+class SaveTest(EditorTestCase):
+    def write(self, data):
+        path = os.path.join(self.temp_dir.name, f"{self.id()}.txt")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_keeps_line_endings(self):
+        for newline in (b"\n", b"\r\n", b"\r"):
+            with self.subTest(newline=newline):
+                path = self.write(b"one" + newline + b"two" + newline)
+                self.open_file(path)
+                self.editor.document.text_area.insert("1.0", "zero\n")
+                self.editor.save_file()
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), b"zero" + newline + b"one" + newline + b"two" + newline)
+                self.editor.close_file()
+
+    @mock.patch("ui.editor.atomic_write")
+    @mock.patch("ui.editor.messagebox")
+    def test_unchanged_buffer_is_not_saved(self, messagebox, atomic_write):
+        self.open_file(self.write(b"text\n"))
+        self.editor.save_file()
+        atomic_write.assert_not_called()
+        self.assertEqual(messagebox.method_calls, [])
+
+    @mock.patch("ui.editor.filedialog")
+    @mock.patch("ui.editor.messagebox")
+    def test_refuses_before_asking_for_a_file_name(self, messagebox, filedialog):
+        self.editor.open_file(self.write(b"text\n" * 100000)) # Still loading right after the call
+        self.editor.save_file_as()
+        messagebox.showwarning.assert_called_once()
+        filedialog.asksaveasfilename.assert_not_called()
+        self.editor.cancel_file_load()
+
+
+if __name__ == "__main__":
+    unittest.main()
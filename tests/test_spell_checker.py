@@ -0,0 +1,97 @@
+import os
+import tempfile
+import unittest
+
+from utils.spell_checker import WORD_PATTERN, SpellCheckerUtil, iter_word_positions
+from utils.spell_engine import check_text
+
+
+class SpellCheckerTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls.temp_dir.cleanup)
+
+    def setUp(self):
+        self.user_dictionary_path = os.path.join(self.temp_dir.name, f"{self.id()}.txt")
+        self.util = self.new_util()
+
+    def new_util(self):
+        return SpellCheckerUtil(cache_dir=self.temp_dir.name, user_dictionary_path=self.user_dictionary_path)
+
+
+class WordPatternTest(unittest.TestCase):
+    def words(self, content):
+        return WORD_PATTERN.findall(content)
+
+    def test_underscores_split_words(self):
+        self.assertEqual(self.words("foo_bar __init__"), ["foo", "bar", "init"])
+
+    def test_apostrophes_join_words(self):
+        self.assertEqual(self.words("don't o'clock don’t"), ["don't", "o'clock", "don’t"])
+
+    def test_leading_and_trailing_apostrophes_are_not_part_of_the_word(self):
+        self.assertEqual(self.words("'quoted' dogs' ''"), ["quoted", "dogs"])
+
+    def test_digits_stay_in_the_word(self):
+        self.assertEqual(self.words("v2 3rd 1.5"), ["v2", "3rd", "1", "5"])
+
+    def test_non_ascii_letters(self):
+        self.assertEqual(self.words("café naïve Straße, ĉu?"), ["café", "naïve", "Straße", "ĉu"])
+
+    def test_punctuation_and_symbols_split_words(self):
+        self.assertEqual(self.words("a-b c.d e/f (g)"), ["a", "b", "c", "d", "e", "f", "g"])
+
+
+class PositionTest(SpellCheckerTestCase):
+    def test_line_and_column(self):
+        content = "one two\n\n  three\ncafé four"
+        self.assertEqual(list(iter_word_positions(content)),
+                         [("one", 1, 0), ("two", 1, 4), ("three", 3, 2), ("café", 4, 0), ("four", 4, 5)])
+
+    def test_start_line(self):
+        self.assertEqual(list(iter_word_positions("a\nb", start_line=10)), [("a", 10, 0), ("b", 11, 0)])
+
+    def test_scan_misspellings(self):
+        content = "The qwzxv sat\non teh mat.\nteh"
+        self.assertEqual(list(self.util.scan_misspellings(content, start_line=5)),
+                         [("qwzxv", 5, 4), ("teh", 6, 3), ("teh", 7, 0)])
+
+    def test_chunks_match_a_single_scan(self):
+        content = "".join(f"line {i} with teh qwzxv word\n" for i in range(50)) + "last teh"
+        expected = [{"word": word, "start": f"{line}.{column}", "end": f"{line}.{column + len(word)}"}
+                    for word, line, column in self.util.scan_misspellings(content)]
+        for chunk_lines in (1, 3, 7, 1000):
+            with self.subTest(chunk_lines=chunk_lines):
+                self.assertEqual(check_text(content, self.util, chunk_lines=chunk_lines), expected)
+
+
+class IsMisspelledTest(SpellCheckerTestCase):
+    def test_dictionary_words(self):
+        self.assertFalse(self.util.is_misspelled("hello"))
+        self.assertFalse(self.util.is_misspelled("Hello"))
+        self.assertFalse(self.util.is_misspelled("don’t"))
+        self.assertTrue(self.util.is_misspelled("qwzxv"))
+
+    def test_words_with_digits_are_not_checked(self):
+        self.assertFalse(self.util.is_misspelled("qwzxv2"))
+
+    def test_user_dictionary(self):
+        self.util.add_to_dictionary("Qwzxv")
+        self.assertFalse(self.util.is_misspelled("qwzxv"))
+        self.assertFalse(self.util.is_misspelled("QWZXV"))
+        self.assertFalse(self.new_util().is_misspelled("qwzxv")) # Kept in the file
+
+    def test_ignored_words_are_for_the_session(self):
+        self.util.ignore_word("qwzxv")
+        self.assertFalse(self.util.is_misspelled("Qwzxv"))
+        self.assertTrue(self.new_util().is_misspelled("qwzxv"))
+
+    def test_scan_skips_added_and_ignored_words(self):
+        self.util.add_to_dictionary("qwzxv")
+        self.util.ignore_word("teh")
+        self.assertEqual(list(self.util.scan_misspellings("qwzxv teh zzxqv")), [("zzxqv", 1, 10)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+
+from tests.editor_case import EditorTestCase
+
+
+class SpellCheckSessionTest(EditorTestCase):
+    # Drives an interactive spell check session through the panel
+    def setUp(self):
+        super().setUp()
+        self.panel = self.editor.spell_panel
+
+    def start_session(self, text):
+        self.editor.document.text_area.insert("1.0", text)
+        self.run_spell_check()
+
+    def misspelled_ranges(self):
+        return len(self.editor.document.text_area.tag_ranges("misspelled")) // 2
+
+    def test_session_opens_docked_on_first_misspelling(self):
+        self.start_session("The qwzxv sat on teh mat.\n")
+        self.assertTrue(self.panel.is_open())
+        self.assertEqual(self.panel.winfo_manager(), "pack")
+        self.assertEqual(self.panel.misspelled_word, "qwzxv")
+        self.assertEqual(self.misspelled_ranges(), 2)
+
+    def test_replace(self):
+        self.start_session("Teh cat and teh dog.\n")
+        self.assertEqual(self.panel.misspelled_word, "Teh")
+        replacement = self.panel.suggestions[0]
+        self.panel.on_replace()
+        self.assertEqual(self.text(), f"{replacement} cat and teh dog.\n")
+        self.assertEqual(self.panel.misspelled_word, "teh") # Advanced to the next one
+
+    def test_replace_keeps_an_edit_made_while_the_word_was_shown(self):
+        self.start_session("The teh cat.\n")
+        self.editor.document.text_area.delete("1.5", "1.6")
+        self.editor.document.text_area.insert("1.5", "x") # teh -> txh
+        self.panel.on_replace()
+        self.assertEqual(self.text(), "The txh cat.\n")
+        self.assertEqual(self.panel.misspelled_word, "txh") # Shown again as it reads now
+
+    def test_text_typed_next_to_a_word_stays_outside_it(self):
+        self.start_session("The teh cat.\n")
+        self.editor.document.text_area.insert("1.7", " big")
+        self.editor.document.text_area.insert("1.4", "a ")
+        replacement = self.panel.suggestions[0]
+        self.panel.on_replace()
+        self.assertEqual(self.text(), f"The a {replacement} big cat.\n")
+        self.editor.document.text_area.edit_undo()
+        self.assertEqual(self.text(), "The a teh big cat.\n")
+
+    def test_replace_all_is_exact_and_one_undo_step(self):
+        original = "teh one, teh two, Teh three\n"
+        self.start_session(original)
+        replacement = self.panel.suggestions[0]
+        self.panel.on_replace_all()
+        self.assertEqual(self.text(), f"{replacement} one, {replacement} two, Teh three\n")
+        self.assertEqual(self.panel.misspelled_word, "Teh") # Different capitalization, left alone
+        self.editor.document.text_area.edit_undo()
+        self.assertEqual(self.text(), original)
+
+    def test_ignore_all_resolves_every_occurrence(self):
+        self.start_session("qwzxv and qwzxv and QWZXV\n")
+        self.panel.on_ignore_all()
+        self.assertIsNone(self.panel.misspelled_word) # Session complete
+        self.assertEqual(self.misspelled_ranges(), 0)
+        self.assertFalse(self.editor.spell_checker_util.is_misspelled("qwzxv"))
+
+    def test_ignore_once_keeps_other_occurrences(self):
+        self.start_session("qwzxv and qwzxv\n")
+        self.panel.on_ignore_once()
+        self.assertEqual(self.panel.misspelled_word, "qwzxv")
+        self.assertEqual(self.misspelled_ranges(), 1)
+
+    def test_float_and_dock(self):
+        self.start_session("The qwzxv sat.\n")
+        self.panel.toggle_floating()
+        self.assertTrue(self.panel.floating)
+        self.assertEqual(self.panel.winfo_manager(), "wm")
+        self.assertTrue(self.panel.is_open())
+        self.panel.toggle_floating()
+        self.assertFalse(self.panel.floating)
+        self.assertEqual(self.panel.winfo_manager(), "pack")
+        self.assertEqual(self.panel.misspelled_word, "qwzxv") # Still on the same word
+
+    def test_close_during_session(self):
+        self.start_session("The qwzxv sat on teh mat.\n")
+        self.panel.on_cancel()
+        self.assertFalse(self.panel.is_open())
+        self.assertFalse(self.editor.document.spell_session_active)
+        self.assertEqual(self.editor.document.text_area.tag_ranges("current_misspelling"), ())
+        self.assertEqual(self.misspelled_ranges(), 2) # Highlights stay
+
+    def test_close_while_floating(self):
+        self.start_session("The qwzxv sat.\n")
+        self.panel.toggle_floating()
+        self.panel.on_cancel()
+        self.assertFalse(self.panel.is_open())
+        self.assertEqual(self.editor.tk.call("wm", "state", self.panel._w), "withdrawn")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+
+from utils.spell_checker import WORD_PATTERN
+from utils.tokenizers import (html_prose_spans, json_prose_spans, mask_non_prose, mask_window,
+                              text_prose_spans, tokenizer_for_path)
+
+HTML_DOCUMENT = """<html>
+<head>
+<!-- a comment
+that goes on: comentt -->
+<style>
+.navbarr { colr: red; }
+</style>
+<script>
+var tehx = a < b;
+</script>
+</head>
+<body><p
+title="tset"
+class=x>Helo caf&eacute; r&#233;sum&eacute; &amp; wrold &lt; x</p>
+</body>
+</html>
+"""
+
+
+def prose(content, tokenizer):
+    return [content[start:end] for start, end in tokenizer(content)]
+
+
+def words(masked):
+    return WORD_PATTERN.findall(masked)
+
+
+class MaskNonProseTest(unittest.TestCase):
+    def test_keeps_length_and_line_breaks(self):
+        masked = mask_non_prose(HTML_DOCUMENT, html_prose_spans)
+        self.assertEqual(len(masked), len(HTML_DOCUMENT))
+        self.assertEqual([i for i, c in enumerate(masked) if c == "\n"],
+                         [i for i, c in enumerate(HTML_DOCUMENT) if c == "\n"])
+
+    def test_prose_stays_in_place(self):
+        content = '{"key": "Helo"}'
+        masked = mask_non_prose(content, json_prose_spans)
+        self.assertEqual(masked.index("Helo"), content.index("Helo"))
+        self.assertEqual(masked.replace("Helo", "").strip(), "")
+
+    def test_without_tokenizer(self):
+        self.assertEqual(mask_non_prose("<p>x</p>", None), "<p>x</p>")
+
+
+class TextTest(unittest.TestCase):
+    def test_skips_links_addresses_and_encoded_data(self):
+        content = "see https://exmaple.com/a?b=c and www.exmaple.org, mail me@exmaple.com, key " + "aGVsbG8gd29ybGQ" * 3 + "= ok"
+        self.assertEqual(words(mask_non_prose(content, text_prose_spans)), ["see", "and", "mail", "key", "ok"])
+
+    def test_keeps_long_hyphenated_words(self):
+        content = "a state-of-the-art-implementation-of-things, id " + "0f3a9c" * 6 + " ok"
+        self.assertEqual(words(mask_non_prose(content, text_prose_spans)),
+                         ["a", "state", "of", "the", "art", "implementation", "of", "things", "id", "ok"])
+
+
+class HTMLTest(unittest.TestCase):
+    def test_only_text_outside_script_and_style(self):
+        masked = mask_non_prose(HTML_DOCUMENT, html_prose_spans)
+        self.assertEqual(words(masked), ["Helo", "wrold", "x"])
+
+    def test_escaped_letters_leave_the_whole_word_out(self):
+        self.assertEqual(words(mask_non_prose("<p>caf&eacute; nice</p>", html_prose_spans)), ["nice"])
+        self.assertEqual(words(mask_non_prose("<p>caf&#xe9;s &amp; more</p>", html_prose_spans)), ["more"])
+        self.assertEqual(words(mask_non_prose("<p>a&nbsp;b</p>", html_prose_spans)), ["a", "b"])
+
+    def test_unfinished_tag_at_the_end(self):
+        self.assertEqual(words(mask_non_prose("Helo <p title='tset'", html_prose_spans)), ["Helo"])
+        self.assertEqual(words(mask_non_prose("Helo <!-- comentt", html_prose_spans)), ["Helo"])
+
+    def test_every_window_reads_like_the_full_document(self):
+        masked = mask_non_prose(HTML_DOCUMENT, html_prose_spans)
+        lines = HTML_DOCUMENT.split("\n")
+        for first in range(len(lines)):
+            for last in range(first, len(lines)):
+                before = "".join(line + "\n" for line in lines[:first])
+                window = "\n".join(lines[first:last + 1])
+                after = HTML_DOCUMENT[len(before) + len(window):]
+                with self.subTest(first=first, last=last):
+                    self.assertEqual(mask_window(window, html_prose_spans, before, after),
+                                     masked[len(before):len(before) + len(window)])
+
+    def test_window_inside_style(self):
+        # Lines 6-7 of HTML_DOCUMENT alone would read the CSS as text
+        lines = HTML_DOCUMENT.split("\n")
+        window = "\n".join(lines[5:7])
+        self.assertEqual(words(mask_non_prose(window, html_prose_spans)), ["navbarr", "colr", "red"])
+        before = "".join(line + "\n" for line in lines[:5])
+        self.assertEqual(words(mask_window(window, html_prose_spans, before, "")), [])
+
+
+class JSONTest(unittest.TestCase):
+    def test_values_not_keys(self):
+        content = '{"kee": "Helo wrold", "n": 1, "list": ["tset", {"k2" : "valu"}]}'
+        self.assertEqual(prose(content, json_prose_spans), ["Helo wrold", "tset", "valu"])
+
+    def test_escapes(self):
+        content = r'{"a": "Helo\nwrold \"quoted\" tab\there"}'
+        self.assertEqual(words(mask_non_prose(content, json_prose_spans)),
+                         ["Helo", "wrold", "quoted", "tab", "here"])
+
+    def test_escaped_letters_leave_the_whole_word_out(self):
+        content = r'{"a": "caf\u00e9 r\u00e9sum\u00e9s are nice", "b": "x y"}'
+        self.assertEqual(words(mask_non_prose(content, json_prose_spans)), ["are", "nice", "x", "y"])
+
+
+class TokenizerForPathTest(unittest.TestCase):
+    def test_by_extension(self):
+        self.assertIs(tokenizer_for_path("a/b/page.HTML"), html_prose_spans)
+        self.assertIs(tokenizer_for_path("data.json"), json_prose_spans)
+        self.assertIs(tokenizer_for_path("notes.md"), text_prose_spans)
+        self.assertIsNone(tokenizer_for_path("script.py"))
+        self.assertIsNone(tokenizer_for_path(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1 @@
+# This file makes the ui directory a Python package.
@@ -0,0 +1,121 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+from utils import instrumentation
+
+# How often the open window picks up new events and counter values
+REFRESH_MS = 1000
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    # Help > Diagnostics: the counters, the most recent timing events (command handlers,
+    # spell check phases, file I/O, highlighting passes) and a cProfile switch for the
+    # Tk thread. Non-modal; it refreshes itself while open.
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Diagnostics")
+        self.geometry("720x520")
+        self._after_id = None
+        self._last_event = None # Newest event already in the list
+
+        notebook = ttk.Notebook(self)
+        notebook.pack(expand=True, fill="both", padx=5, pady=5)
+
+        events_frame = ttk.Frame(notebook)
+        notebook.add(events_frame, text="Events")
+        self.events_tree = ttk.Treeview(events_frame, columns=("seconds", "thread", "details"), show="tree headings")
+        self.events_tree.heading("#0", text="Event")
+        self.events_tree.heading("seconds", text="Seconds")
+        self.events_tree.heading("thread", text="Thread")
+        self.events_tree.heading("details", text="Details")
+        self.events_tree.column("#0", width=200)
+        self.events_tree.column("seconds", width=80, anchor="e")
+        self.events_tree.column("thread", width=100)
+        self.events_tree.column("details", width=320)
+        events_scroll = ttk.Scrollbar(events_frame, orient=tk.VERTICAL, command=self.events_tree.yview)
+        self.events_tree.configure(yscrollcommand=events_scroll.set)
+        events_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.events_tree.pack(expand=True, fill="both")
+
+        counters_frame = ttk.Frame(notebook)
+        notebook.add(counters_frame, text="Counters")
+        self.counters_tree = ttk.Treeview(counters_frame, columns=("value",), show="tree headings")
+        self.counters_tree.heading("#0", text="Counter")
+        self.counters_tree.heading("value", text="Value")
+        self.counters_tree.column("value", anchor="e")
+        self.counters_tree.pack(expand=True, fill="both")
+
+        profile_frame = ttk.Frame(notebook)
+        notebook.add(profile_frame, text="Profile")
+        self.profile_text = tk.Text(profile_frame, wrap=tk.NONE, font=("Courier", 9))
+        self.profile_text.pack(expand=True, fill="both")
+
+        # Buttons
+        button_frame = ttk.Frame(self)
+        button_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+        self.profile_button = ttk.Button(button_frame, command=self.toggle_profiling)
+        self.profile_button.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Save Trace...", command=self.save_trace).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Close", command=self.destroy).pack(side=tk.RIGHT, padx=5)
+        self._update_profile_button()
+
+        self.refresh()
+
+    def refresh(self):
+        # Only events recorded since the last refresh are added to the list.
+        new_events = []
+        for event in reversed(instrumentation.recent_events()):
+            if event is self._last_event:
+                break
+            new_events.append(event)
+        else: # Everything shown before has rotated out (or nothing was shown yet)
+            self.events_tree.delete(*self.events_tree.get_children())
+        for event in reversed(new_events): # Oldest first, so the newest ends up on top
+            details = ", ".join(f"{key}={value}" for key, value in event.items()
+                                if key not in ("name", "seconds", "time", "thread"))
+            self.events_tree.insert("", 0, text=event["name"],
+                                    values=(f"{event['seconds']:.4f}", event.get("thread", ""), details))
+        if new_events:
+            self._last_event = new_events[0]
+        overflow = self.events_tree.get_children()[instrumentation.MAX_RECENT_EVENTS:]
+        if overflow:
+            self.events_tree.delete(*overflow)
+
+        self.counters_tree.delete(*self.counters_tree.get_children())
+        for name, value in sorted(instrumentation.counters().items()):
+            self.counters_tree.insert("", tk.END, text=name, values=(value,))
+
+        self._after_id = self.after(REFRESH_MS, self.refresh)
+
+    def toggle_profiling(self):
+        if instrumentation.profiling_active():
+            report = instrumentation.stop_profiling()
+            self.profile_text.delete("1.0", tk.END)
+            self.profile_text.insert("1.0", report)
+        else:
+            instrumentation.start_profiling()
+        self._update_profile_button()
+
+    def _update_profile_button(self):
+        self.profile_button.config(text="Stop Profiling" if instrumentation.profiling_active() else "Start Profiling")
+
+    def save_trace(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON Files", "*.json"), ("All Files", "*.*")])
+        if not path:
+            return
+        try:
+            instrumentation.dump_trace(path)
+        except OSError as e:
+            messagebox.showerror("Diagnostics", f"Could not save the trace: {e}", parent=self)
+
+    def reset(self):
+        instrumentation.reset()
+        self.events_tree.delete(*self.events_tree.get_children())
+        self._last_event = None
+
+    def destroy(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        super().destroy()
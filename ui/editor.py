@@ -0,0 +1,1277 @@
+import os
+import queue
+import time
+import tkinter as tk
+from contextlib import contextmanager
+from tkinter import ttk, scrolledtext, filedialog, messagebox
+from utils.spell_checker import SpellCheckerUtil, WORD_PATTERN, normalize_word
+from utils.spell_engine import SpellCheckJob
+from utils.dirty_lines import DirtyLineRanges
+from utils.whitespace import iter_space_runs, find_whitespace_runs
+from utils.file_io import ChunkedFileLoader, atomic_write
+from utils import instrumentation
+from utils.large_file import MappedTextFile
+from utils.tokenizers import WINDOW_CONTEXT, mask_window, tokenizer_for_path
+from ui.spell_dialog import SpellCheckPanel
+from ui.diagnostics_window import DiagnosticsWindow
+
+# Number of ranges sent to the text widget per tag_add call when tagging in bulk
+TAG_BATCH_SIZE = 1000
+# Prefix of the text marks that hold the position of each misspelling found by a check
+MISSPELLING_MARK_PREFIX = "misspelling_"
+# How often (ms) the Tk loop collects spell-check results, and how long (s) it may spend
+# applying them per tick before yielding back to the event loop
+SPELL_CHECK_POLL_MS = 30
+SPELL_CHECK_POLL_BUDGET = 0.02
+# Number of upcoming misspellings whose suggestions are prepared while the dialog is open
+SUGGESTION_PREFETCH = 2
+# Quiet period (ms) after the last edit before edited lines are re-checked as you type
+RECHECK_DELAY_MS = 300
+# Visible-region-only highlighting: extra lines highlighted above and below the window,
+# and the delay (ms) before highlights follow a scroll or resize
+VIEWPORT_MARGIN_LINES = 50
+VIEWPORT_REFRESH_MS = 50
+# How often (ms) the Tk loop appends loaded text, and how long (s) it may spend per tick
+FILE_LOAD_POLL_MS = 20
+FILE_LOAD_POLL_BUDGET = 0.03
+# Files at least this large open in the read-only memory-mapped viewer instead of being
+# loaded into the widget; the viewer keeps VIEWER_WINDOW_LINES lines in the widget at a time
+MAPPED_VIEWER_THRESHOLD = 512 * 1024 * 1024
+VIEWER_WINDOW_LINES = 2000
+VIEWER_INDEX_POLL_MS = 200
+# Lines read around a window of lines for tokenizers that depend on context (HTML): a
+# comment or <script>/<style> element longer than this that crosses the window's edge
+# is misread
+TOKENIZER_CONTEXT_LINES = 1000
+# Lines read from the widget per chunk when saving
+SAVE_CHUNK_LINES = 5000
+# Number of whitespace runs removed per widget delete call
+DELETE_BATCH_SIZE = 1000
+# Edit menu commands that change the text, unavailable while a check has the widget read-only
+EDITING_COMMANDS = ("Delete All Spaces in Document", "Delete Spaces in Selected Lines")
+
+# Tcl side of TrackedText: only insert/delete/replace call back into Python, every other
+# widget command (tag, index, get, ...) goes straight to the real widget. Errors from the
+# real widget propagate as normal Tcl errors, so Tk's own bindings behave as before.
+_TRACKED_TEXT_PROXY = """
+proc ::tracked_text_proxy {orig callback args} {
+    switch -- [lindex $args 0] {
+        insert - delete - replace {
+            $callback before {*}$args
+            set result [$orig {*}$args]
+            $callback after {*}$args
+            return $result
+        }
+    }
+    return [$orig {*}$args]
+}
+"""
+
+class TrackedText(scrolledtext.ScrolledText):
+    # ScrolledText that reports every change to its text, whether made from code, by
+    # typing or by Tk's bindings (paste, undo, ...), as on_change(line, removed, added):
+    # starting on `line`, `removed` line breaks were replaced by `added` ones.
+    def __init__(self, master=None, on_change=None, **kw):
+        super().__init__(master, **kw)
+        self.on_change = on_change
+        self._pending_edits = None # Line ranges of the edit in progress, computed before it runs
+        self._orig_command = self._w + "_orig"
+        if not self.tk.call("info", "procs", "::tracked_text_proxy"):
+            self.tk.eval(_TRACKED_TEXT_PROXY)
+        callback = self.register(self._on_edit)
+        self.tk.call("rename", self._w, self._orig_command)
+        self.tk.call("interp", "alias", "", self._w, "", "::tracked_text_proxy", self._orig_command, callback)
+
+    def destroy(self):
+        self.tk.call("interp", "alias", "", self._w, "")
+        super().destroy()
+
+    def _line(self, index):
+        return int(self.tk.call(self._orig_command, "index", index).split(".")[0])
+
+    def _on_edit(self, phase, operation, *args):
+        if phase == "before":
+            self._pending_edits = None
+            if self.on_change is None or str(self.tk.call(self._orig_command, "cget", "-state")) == tk.DISABLED:
+                return
+            last_line = self._line("end-1c") # Inserts past the end land on the last line
+            if operation == "insert":
+                added = sum(chars.count("\n") for chars in args[1::2])
+                self._pending_edits = [(min(self._line(args[0]), last_line), 0, added)]
+            elif operation == "replace":
+                added = sum(chars.count("\n") for chars in args[2::2])
+                first, last = self._line(args[0]), min(self._line(args[1]), last_line)
+                self._pending_edits = [(first, last - first, added)]
+            else: # delete index1 ?index2 ...?; a lone index deletes one character
+                if len(args) % 2:
+                    args = args + (f"{args[-1]}+1c",)
+                edits = []
+                for i in range(0, len(args), 2):
+                    first, last = self._line(args[i]), min(self._line(args[i + 1]), last_line)
+                    edits.append((first, max(last - first, 0), 0))
+                # Reported bottom-up so each edit's line numbers are still valid when applied
+                self._pending_edits = sorted(edits, reverse=True)
+        elif self._pending_edits:
+            edits, self._pending_edits = self._pending_edits, None
+            for line, removed, added in edits:
+                self.on_change(line, removed, added)
+
+
+class Document:
+    # One tab: its text widget and all state tied to the widget's contents. Editor-wide
+    # resources (the SpellCheckerUtil with its dictionary and suggestion cache, the spell
+    # check panel, the menus) are shared by every tab.
+    def __init__(self, text_area):
+        self.text_area = text_area
+        self.filepath = None # File the buffer was opened from or last saved to
+        self.newline = None # The file's line ending, written back on save (None: os.linesep)
+        self.tokenizer = None # Picks the prose out of the file's format, see utils/tokenizers.py
+        self.file_loader = None # Background ChunkedFileLoader while a file is being opened
+        self._file_load_started = None
+        self.load_progress = 0 # Percent loaded or indexed, for the status bar
+        self.mapped_file = None # MappedTextFile when a large file is shown in the read-only viewer
+        self.viewer_first_line = 0 # File line (0-based) shown on the widget's first line
+        self.viewer_loaded_lines = 0
+        self.viewer_top_line = None # Set while the viewer's window is unloaded (tab hidden)
+        self._viewer_after_id = None
+        self.spell_check_job = None # Background SpellCheckJob while a check is running
+        self._spell_check_started = None
+        self.current_misspellings_list = [] # Occurrences found by the last check, see _add_misspellings
+        self.misspellings_by_word = {} # normalize_word(word) -> its occurrences, for the "All" actions
+        self.open_misspelling_count = 0 # Occurrences not yet resolved, shown in the spell check panel
+        self._misspelling_mark_count = 0
+        self.current_misspelling_index = 0
+        self.spell_session_active = False # Interactive pass in progress (shown when the tab is selected)
+        self.misspelling_highlights_active = False # Set once misspellings are being highlighted
+        self.misspelling_tags_stale = False # Results arrived while hidden and were not tagged yet
+        self.highlight_spaces = False
+        self.dirty_lines = DirtyLineRanges() # Lines edited since the last incremental re-check
+        self._recheck_after_id = None
+        self._viewport_lines = None # (first, last) lines currently highlighted in viewport mode
+        self._viewport_after_id = None
+
+    @property
+    def path(self):
+        # File shown in the tab, also while it is still loading
+        if self.mapped_file is not None:
+            return self.mapped_file.path
+        if self.file_loader is not None:
+            return self.file_loader.path
+        return self.filepath
+
+    def is_blank(self):
+        # An untitled, unmodified, empty tab, which opening a file reuses
+        return (self.path is None and not self.text_area.edit_modified()
+                and self.text_area.compare("end-1c", "==", "1.0"))
+
+
+class TextEditor(tk.Tk):
+    # Per-tab state is always reached through self.document: the selected tab, or the
+    # tab a background callback was scheduled for (see _bind_document). Attributes of
+    # the editor itself are shared by every tab.
+
+    def __init__(self):
+        super().__init__()
+        self.title("Simple Text Editor")
+        self.geometry("800x600")
+        
+        self.highlight_spaces_active = tk.BooleanVar(value=False) # Checkbutton state, mirrors the selected tab
+        self.check_as_you_type = tk.BooleanVar(value=False)
+        self.viewport_highlighting = tk.BooleanVar(value=False) # Highlight only the visible region
+        self.fsync_policy = tk.StringVar(value="file") # See utils.file_io.FSYNC_POLICIES
+        self.whitespace_mode = tk.StringVar(value="spaces") # See utils.whitespace.WHITESPACE_PATTERNS
+        self.diagnostics_window = None
+        self._spell_checker_util = None
+        self.documents = [] # In tab order
+        self.document = None
+        self.selected_document = None
+
+        self._create_menu()
+        self._create_status_bar()
+        self._create_notebook()
+        self.spell_panel = SpellCheckPanel(self, self._on_spell_panel_action,
+                                           dock_options={"side": tk.RIGHT, "fill": tk.Y, "before": self.notebook})
+        self.new_file()
+
+    @property
+    def spell_checker_util(self):
+        # Shared by every tab. Created on first use, so the dictionary is only opened
+        # once something is spell checked; tests and benchmarks may assign their own.
+        if self._spell_checker_util is None:
+            self._spell_checker_util = SpellCheckerUtil()
+        return self._spell_checker_util
+
+    @spell_checker_util.setter
+    def spell_checker_util(self, spell_checker_util):
+        self._spell_checker_util = spell_checker_util
+
+    def _create_menu(self):
+        menubar = tk.Menu(self)
+        self.config(menu=menubar)
+
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="File", menu=file_menu)
+        file_menu.add_command(label="New", command=self._instrumented(self.new_file))
+        file_menu.add_command(label="Open", command=self._instrumented(self.open_file))
+        file_menu.add_command(label="Save", command=self._instrumented(self.save_file))
+        file_menu.add_command(label="Save As...", command=self._instrumented(self.save_file_as))
+        file_menu.add_command(label="Close Tab", command=self._instrumented(self.close_file))
+        fsync_menu = tk.Menu(file_menu, tearoff=0)
+        file_menu.add_cascade(label="Sync to Disk on Save", menu=fsync_menu)
+        fsync_menu.add_radiobutton(label="Never (fastest)", value="none", variable=self.fsync_policy)
+        fsync_menu.add_radiobutton(label="File", value="file", variable=self.fsync_policy)
+        fsync_menu.add_radiobutton(label="File and Folder", value="full", variable=self.fsync_policy)
+        file_menu.add_separator()
+        file_menu.add_command(label="Exit", command=self.quit)
+
+        edit_menu = tk.Menu(menubar, tearoff=0)
+        self.edit_menu = edit_menu
+        menubar.add_cascade(label="Edit", menu=edit_menu)
+        edit_menu.add_command(label="Cut", command=self._instrumented(self.cut_text))
+        edit_menu.add_command(label="Copy", command=self._instrumented(self.copy_text))
+        edit_menu.add_command(label="Paste", command=self._instrumented(self.paste_text))
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Spell Check", command=self._instrumented(self.spell_check_text))
+        edit_menu.add_command(label="Cancel Spell Check", command=self._instrumented(self.cancel_spell_check), state=tk.DISABLED)
+        edit_menu.add_checkbutton(label="Check Spelling As You Type", onvalue=True, offvalue=False, variable=self.check_as_you_type, command=self._instrumented(self.toggle_check_as_you_type))
+        edit_menu.add_checkbutton(label="Highlight Spaces", onvalue=True, offvalue=False, variable=self.highlight_spaces_active, command=self._instrumented(self.toggle_highlight_spaces))
+        edit_menu.add_checkbutton(label="Highlight Visible Region Only", onvalue=True, offvalue=False, variable=self.viewport_highlighting, command=self._instrumented(self.toggle_viewport_highlighting))
+        edit_menu.add_separator()
+        edit_menu.add_command(label="Delete All Spaces in Document", command=self._instrumented(self.delete_all_spaces))
+        edit_menu.add_command(label="Delete Spaces in Selected Lines", command=self._instrumented(self.delete_spaces_in_selected_lines))
+        whitespace_menu = tk.Menu(edit_menu, tearoff=0)
+        edit_menu.add_cascade(label="Whitespace to Delete", menu=whitespace_menu)
+        whitespace_menu.add_radiobutton(label="Spaces", value="spaces", variable=self.whitespace_mode)
+        whitespace_menu.add_radiobutton(label="Tabs", value="tabs", variable=self.whitespace_mode)
+        whitespace_menu.add_radiobutton(label="Non-breaking Spaces", value="nbsp", variable=self.whitespace_mode)
+        whitespace_menu.add_radiobutton(label="All Whitespace", value="all", variable=self.whitespace_mode)
+        whitespace_menu.add_radiobutton(label="Trailing Whitespace Only", value="trailing", variable=self.whitespace_mode)
+
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Help", menu=help_menu)
+        help_menu.add_command(label="Diagnostics...", command=self.show_diagnostics)
+
+    def _instrumented(self, handler):
+        # Menu commands are reported as "command:<handler name>" timing events, so a
+        # freeze can be traced back to the command that caused it.
+        return instrumentation.instrument(handler.__name__, handler)
+
+    def show_diagnostics(self):
+        # One window, raised again if already open
+        if self.diagnostics_window is not None and self.diagnostics_window.winfo_exists():
+            self.diagnostics_window.lift()
+            return
+        self.diagnostics_window = DiagnosticsWindow(self)
+
+    def _create_notebook(self):
+        self.notebook = ttk.Notebook(self)
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self._on_tab_changed())
+        self.notebook.pack(expand=True, fill="both")
+
+    def _create_document(self):
+        # A new tab with its own text widget; the widget's callbacks run with the tab's
+        # document as self.document, whichever tab is selected at the time.
+        text_area = TrackedText(self.notebook, wrap=tk.WORD, undo=True)
+        document = Document(text_area)
+        text_area.on_change = self._bind_document(document, self._on_text_change)
+        # Configure a tag for highlighting misspelled words
+        text_area.tag_configure("misspelled", background="yellow", foreground="red")
+        # Configure a tag for highlighting spaces
+        text_area.tag_configure("space", background="lightgray")
+        # Route scroll updates through the editor so visible-region highlighting can follow them
+        text_area.configure(yscrollcommand=self._bind_document(document, self._on_text_yscroll))
+        text_area.vbar.config(command=self._bind_document(document, self._on_vbar_scroll))
+        text_area.bind("<Configure>", lambda event: self._bind_document(document, self._schedule_viewport_refresh)())
+        self.notebook.add(text_area.frame, text="Untitled")
+        self.documents.append(document)
+        return document
+
+    @contextmanager
+    def _document_context(self, document):
+        previous, self.document = self.document, document
+        try:
+            yield
+        finally:
+            self.document = previous
+
+    def _bind_document(self, document, handler):
+        # Callback (for after(), widget commands, ...) that runs handler on document
+        def callback(*args):
+            if document not in self.documents: # Tab closed since
+                return None
+            with self._document_context(document):
+                return handler(*args)
+        return callback
+
+    def _is_selected(self):
+        return self.document is self.selected_document
+
+    def _select_document(self, document):
+        self.notebook.select(document.text_area.frame)
+        self._on_tab_changed()
+
+    def _on_tab_changed(self):
+        selected = self.notebook.select()
+        document = next((d for d in self.documents if str(d.text_area.frame) == selected), None)
+        if document is None or document is self.selected_document:
+            return
+        if self.selected_document is not None:
+            self._deactivate_document(self.selected_document)
+        self.selected_document = self.document = document
+        self._activate_document(document)
+
+    def _deactivate_document(self, document):
+        # The tab is being hidden: stop its highlighting work and unload what can be
+        # reloaded cheaply. Background loads and checks keep running.
+        with self._document_context(document):
+            self.spell_panel.close()
+            if document._viewport_after_id is not None:
+                self.after_cancel(document._viewport_after_id)
+                document._viewport_after_id = None
+            if document.mapped_file is not None and document.viewer_top_line is None:
+                # Read-only viewer: keep only the file position; the window is re-read from
+                # the mapped file when the tab is shown again.
+                top = int(document.text_area.index("@0,0").split('.')[0]) - 1
+                document.viewer_top_line = document.viewer_first_line + top
+                document.text_area.config(state=tk.NORMAL)
+                document.text_area.delete("1.0", tk.END)
+                document.text_area.config(state=tk.DISABLED)
+                document.viewer_loaded_lines = 0
+
+    def _activate_document(self, document):
+        # The tab was selected: restore its window-level state. Tags, marks and the
+        # misspelling list never left the widget, so nothing is re-scanned.
+        self.highlight_spaces_active.set(document.highlight_spaces)
+        self._update_edit_menu()
+        self._update_title()
+        self._update_status_bar()
+        if document.viewer_top_line is not None:
+            top_line, document.viewer_top_line = document.viewer_top_line, None
+            self._viewer_load_window(top_line)
+        if document.misspelling_tags_stale:
+            document.misspelling_tags_stale = False
+            if not self.viewport_highlighting.get():
+                self._tag_misspelling_list()
+        if self.viewport_highlighting.get():
+            document._viewport_lines = None
+            self._schedule_viewport_refresh()
+        if document.dirty_lines and document._recheck_after_id is None:
+            document._recheck_after_id = self.after(RECHECK_DELAY_MS,
+                                                    self._bind_document(document, self._recheck_dirty_lines))
+        if document.spell_session_active:
+            self.spell_panel.open()
+            self._show_next_misspelling()
+
+    def _update_title(self):
+        # Tab label and, for the selected tab, the window title
+        path = self.document.path
+        read_only = " [read-only]" if self.document.mapped_file is not None else ""
+        self.notebook.tab(self.document.text_area.frame, text=(os.path.basename(path) if path else "Untitled") + read_only)
+        if self._is_selected():
+            self.title(f"Simple Text Editor - {path}{read_only}" if path else "Simple Text Editor")
+
+    def _update_status_bar(self):
+        # Progress of the selected tab's load or line indexing; hidden when there is none.
+        document = self.selected_document
+        if document.file_loader is not None:
+            text = f"Loading {document.file_loader.path}..."
+        elif document.mapped_file is not None and not document.mapped_file.index_complete.is_set():
+            text = f"Indexing {document.mapped_file.path}..."
+        else:
+            self.status_bar.pack_forget()
+            return
+        self.status_label.config(text=text)
+        self.load_progress["value"] = document.load_progress
+        if not self.status_bar.winfo_manager():
+            self.status_bar.pack(side=tk.BOTTOM, fill=tk.X, before=self.notebook)
+
+    def _create_status_bar(self):
+        # Shown only while a file is loading: progress and a way to cancel.
+        self.status_bar = ttk.Frame(self)
+        self.status_label = ttk.Label(self.status_bar)
+        self.status_label.pack(side=tk.LEFT, padx=5)
+        ttk.Button(self.status_bar, text="Cancel", command=self.cancel_file_load).pack(side=tk.RIGHT, padx=5, pady=2)
+        self.load_progress = ttk.Progressbar(self.status_bar, mode="determinate", maximum=100)
+        self.load_progress.pack(side=tk.RIGHT, fill=tk.X, expand=True, padx=5)
+
+    def new_file(self):
+        self._select_document(self._create_document())
+
+    def close_file(self):
+        document = self.document
+        if (document.file_loader is None and document.mapped_file is None
+                and document.text_area.edit_modified()):
+            answer = messagebox.askyesnocancel("Close Tab", f"Save changes to {document.path or 'Untitled'}?", parent=self)
+            if answer is None:
+                return
+            if answer:
+                self.save_file()
+                if document.text_area.edit_modified(): # Save cancelled or failed
+                    return
+
+        if document.file_loader is not None:
+            document.file_loader.cancel()
+        if document.spell_check_job is not None:
+            document.spell_check_job.cancel()
+        self._close_mapped_file()
+        self._end_spell_session()
+        for after_id in (document._recheck_after_id, document._viewport_after_id):
+            if after_id is not None:
+                self.after_cancel(after_id)
+        self.documents.remove(document)
+        self.selected_document = self.document = None
+        self.notebook.forget(document.text_area.frame)
+        document.text_area.frame.destroy()
+
+        if self.documents:
+            self._on_tab_changed()
+        else:
+            self.new_file()
+
+    def open_file(self, filepath=None):
+        if filepath is None: # From the menu; scripts (e.g. the benchmarks) pass the path
+            filepath = filedialog.askopenfilename(
+                filetypes=[("All Files", "*.*")]
+            )
+        if not filepath:
+            return
+        try:
+            if os.path.getsize(filepath) >= MAPPED_VIEWER_THRESHOLD:
+                loader = None
+                mapped_file = MappedTextFile(filepath, encoding='utf-8')
+            else:
+                loader = ChunkedFileLoader(filepath, encoding='utf-8')
+        except Exception as e:
+            # Handle potential errors like file not found or permission issues
+            messagebox.showerror("Error", f"Could not open file: {e}", parent=self)
+            return
+
+        if not self.document.is_blank(): # Open in a new tab rather than replacing this one
+            self.new_file()
+        if self.document.file_loader is not None:
+            self.document.file_loader.cancel()
+            self.document.file_loader = None
+        if self.document.spell_check_job is not None:
+            self.document.spell_check_job.cancel()
+            self._finish_spell_check(interactive=False)
+        self._close_mapped_file()
+        self._end_spell_session()
+        self._clear_misspelling_marks()
+
+        self.document.text_area.config(state=tk.NORMAL)
+        self.document.text_area.delete("1.0", tk.END)
+        self.document.text_area.config(state=tk.DISABLED, undo=False) # Read-only until the whole file is in
+        self.document.filepath = None # Set once the file has been loaded completely
+        self.document.newline = None
+        self.document.tokenizer = tokenizer_for_path(filepath)
+
+        if loader is None:
+            self._open_mapped_viewer(mapped_file)
+            return
+
+        # The file is read and decoded on a worker thread; _poll_file_load appends it to
+        # the widget in batches so the first screenful shows up right away.
+        self.document.file_loader = loader.start()
+        self.document.load_progress = 0
+        self._update_title()
+        self._update_status_bar()
+        self.document._file_load_started = time.perf_counter()
+        self.after(FILE_LOAD_POLL_MS, self._bind_document(self.document, self._poll_file_load), loader)
+
+    def _poll_file_load(self, loader):
+        document = self.document
+        if loader is not document.file_loader: # Cancelled or superseded by another open
+            return
+
+        pending = []
+        bytes_read = None
+        finished = None
+        deadline = time.monotonic() + FILE_LOAD_POLL_BUDGET
+        while time.monotonic() < deadline:
+            try:
+                message = loader.results.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] == "data":
+                pending.append(message[1])
+                bytes_read = message[2]
+            else:
+                finished = message
+                break
+
+        if pending:
+            document.text_area.config(state=tk.NORMAL)
+            document.text_area.insert(tk.END, "".join(pending))
+            document.text_area.config(state=tk.DISABLED)
+        if bytes_read is not None and loader.total_bytes:
+            document.load_progress = 100 * bytes_read / loader.total_bytes
+            if self._is_selected():
+                self.load_progress["value"] = document.load_progress
+
+        if finished is None:
+            self.after(FILE_LOAD_POLL_MS, self._bind_document(document, self._poll_file_load), loader)
+        elif finished[0] == "done":
+            self._finish_file_load()
+            document.filepath = loader.path
+            document.newline = loader.newline
+            document.text_area.edit_reset()
+            document.text_area.edit_modified(False)
+            self._update_title()
+            instrumentation.record("open_file", time.perf_counter() - document._file_load_started, bytes=finished[1])
+        elif finished[0] == "error":
+            self._finish_file_load()
+            document.text_area.delete("1.0", tk.END)
+            self._update_title()
+            # E.g. a decode error partway through: the tab is left empty
+            messagebox.showerror("Error", f"Could not open {loader.path}: {finished[1]}", parent=self)
+
+    def _finish_file_load(self):
+        self.document.file_loader = None
+        if self._is_selected():
+            self._update_status_bar()
+        self.document.text_area.config(state=tk.NORMAL, undo=True)
+
+    def cancel_file_load(self):
+        document = self.document
+        if document.file_loader is None:
+            if document.mapped_file is not None: # Still indexing a file in the viewer
+                filepath = document.mapped_file.path
+                self._close_mapped_file()
+                self._update_status_bar()
+                document.text_area.config(state=tk.NORMAL, undo=True)
+                document.text_area.delete("1.0", tk.END)
+                self._update_title()
+                print(f"Cancelled opening {filepath}")
+            return
+        filepath = document.file_loader.path
+        document.file_loader.cancel()
+        self._finish_file_load()
+        # A partially loaded file must not be mistaken for the real thing
+        document.text_area.delete("1.0", tk.END)
+        self._update_title()
+        print(f"Cancelled opening {filepath}")
+
+    def _open_mapped_viewer(self, mapped_file):
+        # Files too large for the text widget are memory-mapped and shown read-only, a
+        # window of lines at a time. The line index is built in the background; the
+        # beginning of the file can be viewed while it is running.
+        self.document.mapped_file = mapped_file.start_indexing()
+        self.document.load_progress = 0
+        self._update_title()
+        self._update_status_bar()
+        self._viewer_load_window(0)
+        self.after(VIEWER_INDEX_POLL_MS, self._bind_document(self.document, self._poll_line_index), mapped_file)
+
+    def _close_mapped_file(self):
+        document = self.document
+        if document.mapped_file is None:
+            return
+        document.mapped_file.close()
+        document.mapped_file = None
+        document.viewer_top_line = None
+        document.text_area.config(undo=True)
+        if document._viewer_after_id is not None:
+            self.after_cancel(document._viewer_after_id)
+            document._viewer_after_id = None
+
+    def _poll_line_index(self, mapped_file):
+        document = self.document
+        if mapped_file is not document.mapped_file:
+            return
+        if mapped_file.size:
+            document.load_progress = 100 * mapped_file.indexed_bytes / mapped_file.size
+        # The window may have been cut short by the index so far; fill it up as it grows.
+        # A hidden tab's window is unloaded and is read in full when it is shown.
+        available = mapped_file.line_count() - document.viewer_first_line
+        if document.viewer_top_line is None and document.viewer_loaded_lines < min(available, VIEWER_WINDOW_LINES):
+            top = document.viewer_first_line + int(document.text_area.index("@0,0").split('.')[0]) - 1
+            self._viewer_load_window(top)
+        if self._is_selected():
+            self._update_status_bar()
+        if not mapped_file.index_complete.is_set():
+            self.after(VIEWER_INDEX_POLL_MS, self._bind_document(document, self._poll_line_index), mapped_file)
+
+    def _viewer_load_window(self, top_line):
+        # Loads the window of file lines around top_line into the widget and scrolls so
+        # that top_line is at the top.
+        document = self.document
+        total = document.mapped_file.line_count()
+        top_line = max(0, min(top_line, total - 1))
+        first = max(0, min(top_line - VIEWER_WINDOW_LINES // 2, total - VIEWER_WINDOW_LINES))
+        document.viewer_first_line = first
+        document.viewer_loaded_lines = min(VIEWER_WINDOW_LINES, total - first)
+        with instrumentation.timed("viewer_load_window", first_line=first):
+            document.text_area.config(state=tk.NORMAL)
+            document.text_area.delete("1.0", tk.END)
+            document.text_area.insert("1.0", document.mapped_file.read_lines(first, VIEWER_WINDOW_LINES))
+            document.text_area.config(state=tk.DISABLED)
+            document.text_area.yview(f"{top_line - first + 1}.0")
+            self._refresh_window_highlights()
+
+    def _refresh_window_highlights(self):
+        # Space and misspelling highlights for the lines currently loaded in the viewer
+        if self.viewport_highlighting.get():
+            self.document._viewport_lines = None
+            self._refresh_viewport_highlights()
+            return
+        last_line = int(self.document.text_area.index("end-1c").split('.')[0])
+        if self.document.highlight_spaces:
+            self._tag_spaces(1, last_line)
+        if self.document.misspelling_highlights_active:
+            self._tag_misspellings(1, last_line)
+
+    def _on_vbar_scroll(self, *args):
+        if self.document.mapped_file is None:
+            self.document.text_area.yview(*args)
+        elif args[0] == "moveto":
+            # The scrollbar spans the whole file: jump straight to the matching line.
+            self._viewer_load_window(int(float(args[1]) * self.document.mapped_file.line_count()))
+        else: # Line/page steps scroll within the window; _viewer_on_yscroll moves the window
+            self.document.text_area.yview(*args)
+
+    def _viewer_on_yscroll(self):
+        document = self.document
+        top = int(document.text_area.index("@0,0").split('.')[0]) - 1
+        bottom = int(document.text_area.index(f"@0,{document.text_area.winfo_height()}").split('.')[0])
+        total = document.mapped_file.line_count()
+        first_line = document.viewer_first_line
+        document.text_area.vbar.set((first_line + top) / total, min((first_line + bottom) / total, 1.0))
+
+        # Near either edge of the loaded window, re-centre the window on the current position
+        margin = VIEWER_WINDOW_LINES // 4
+        near_top = top < margin and first_line > 0
+        near_bottom = bottom > document.viewer_loaded_lines - margin and first_line + document.viewer_loaded_lines < total
+        if (near_top or near_bottom) and document._viewer_after_id is None:
+            document._viewer_after_id = self.after_idle(self._bind_document(document, self._viewer_recenter))
+
+    def _viewer_recenter(self):
+        document = self.document
+        document._viewer_after_id = None
+        if document.mapped_file is None or document.viewer_top_line is not None: # Closed, or unloaded while hidden
+            return
+        top_line = document.viewer_first_line + int(document.text_area.index("@0,0").split('.')[0]) - 1
+        first = max(0, min(top_line - VIEWER_WINDOW_LINES // 2, document.mapped_file.line_count() - VIEWER_WINDOW_LINES))
+        if first != document.viewer_first_line:
+            self._viewer_load_window(top_line)
+
+    def save_file(self):
+        if not self._can_save():
+            return
+        if self.document.filepath is None:
+            self.save_file_as()
+            return
+        # Dirty tracking: saving a buffer that has not changed since it was loaded or
+        # saved does nothing.
+        if not self.document.text_area.edit_modified():
+            return
+        self._write_buffer(self.document.filepath)
+
+    def save_file_as(self):
+        if not self._can_save(): # Before asking for a file name
+            return
+        filepath = filedialog.asksaveasfilename(
+            filetypes=[("All Files", "*.*")]
+        )
+        if not filepath:
+            return
+        self._write_buffer(filepath)
+
+    def _can_save(self):
+        if self.document.file_loader is not None:
+            messagebox.showwarning("Save", "Cannot save while the file is still loading.", parent=self)
+            return False
+        if self.document.mapped_file is not None:
+            messagebox.showwarning("Save", "The large-file viewer is read-only; it cannot be saved.", parent=self)
+            return False
+        return True
+
+    def _write_buffer(self, filepath):
+        try:
+            with instrumentation.timed("save_file", trace_memory=True) as fields:
+                fields["bytes"] = atomic_write(filepath, self._iter_buffer_chunks(), encoding='utf-8',
+                                              fsync=self.fsync_policy.get(), newline=self.document.newline)
+        except Exception as e:
+            messagebox.showerror("Error", f"Could not save file: {e}", parent=self)
+            return
+        self.document.filepath = filepath
+        self.document.tokenizer = tokenizer_for_path(filepath)
+        self.document.text_area.edit_modified(False)
+        self._update_title()
+
+    def _iter_buffer_chunks(self):
+        # The buffer is read SAVE_CHUNK_LINES lines at a time rather than as one string,
+        # so saving never holds a second full copy of a large document in memory.
+        last_line = int(self.document.text_area.index("end-1c").split('.')[0])
+        for first in range(1, last_line + 1, SAVE_CHUNK_LINES):
+            next_first = first + SAVE_CHUNK_LINES
+            end_pos = f"{next_first}.0" if next_first <= last_line else "end-1c"
+            yield self.document.text_area.get(f"{first}.0", end_pos)
+
+    def cut_text(self):
+        # Placeholder for cut text functionality
+        print("Cut text action")
+
+    def copy_text(self):
+        # Placeholder for copy text functionality
+        print("Copy text action")
+
+    def paste_text(self):
+        # Placeholder for paste text functionality
+        print("Paste text action")
+
+    def spell_check_text(self):
+        document = self.document
+        if document.mapped_file is not None:
+            # Read-only viewer: highlight the loaded window; it follows the scroll position.
+            document.misspelling_highlights_active = True
+            self._refresh_window_highlights()
+            return
+
+        document.text_area.tag_remove("misspelled", "1.0", tk.END) # Clear previous general highlights
+        
+        if document.highlight_spaces:
+            self._apply_space_highlighting()
+
+        content = document.text_area.get("1.0", tk.END)
+        if document.spell_check_job is not None: # Restarting replaces any check still running
+            document.spell_check_job.cancel()
+
+        # Start a new list of misspelled word instances, dropping the marks of the last one
+        self._clear_misspelling_marks()
+        document.spell_session_active = False
+        document.misspelling_tags_stale = False
+        document.text_area.tag_remove("current_misspelling", "1.0", tk.END)
+        if self.spell_panel.is_open():
+            self.spell_panel.show_message("Checking...")
+        document.misspelling_highlights_active = True
+        if self.viewport_highlighting.get():
+            self._refresh_viewport_highlights()
+        document.text_area.config(state=tk.DISABLED) # Keep indices valid while results stream in
+
+        # Dictionary lookups run on a worker thread over line chunks;
+        # _poll_spell_check picks up the results from the Tk main loop.
+        document.spell_check_job = SpellCheckJob(self.spell_checker_util, content, tokenizer=document.tokenizer).start()
+        self._update_edit_menu()
+        document._spell_check_started = time.perf_counter()
+        self.after(SPELL_CHECK_POLL_MS, self._bind_document(document, self._poll_spell_check), document.spell_check_job)
+
+    def _update_edit_menu(self):
+        # While a check runs the widget is read-only, and Tk silently ignores deletes on
+        # it: the editing commands are disabled until it finishes or is cancelled.
+        running = self.document.spell_check_job is not None
+        self.edit_menu.entryconfig("Cancel Spell Check", state=tk.NORMAL if running else tk.DISABLED)
+        for label in EDITING_COMMANDS:
+            self.edit_menu.entryconfig(label, state=tk.DISABLED if running else tk.NORMAL)
+
+    def _poll_spell_check(self, job):
+        if job is not self.document.spell_check_job: # Cancelled or superseded by a newer check
+            return
+
+        deadline = time.monotonic() + SPELL_CHECK_POLL_BUDGET
+        while time.monotonic() < deadline:
+            try:
+                kind, payload = job.results.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "chunk":
+                # Tag first, while the positions are still plain line.col indices. A hidden
+                # tab is tagged from the marks when it is shown again.
+                if self.viewport_highlighting.get(): # Tags are managed per visible region
+                    pass
+                elif not self._is_selected():
+                    self.document.misspelling_tags_stale = True
+                else:
+                    for i in range(0, len(payload), TAG_BATCH_SIZE):
+                        ranges = []
+                        for item in payload[i:i + TAG_BATCH_SIZE]:
+                            ranges.extend((item["start"], item["end"]))
+                        self._add_tag_ranges("misspelled", ranges)
+                self._add_misspellings(payload)
+            elif kind == "done":
+                self._finish_spell_check()
+                return
+            elif kind == "error":
+                self._finish_spell_check(interactive=False)
+                messagebox.showerror("Spell Check", f"Spell check failed: {payload}", parent=self)
+                return
+            else: # "cancelled"
+                return
+
+        self.after(SPELL_CHECK_POLL_MS, self._bind_document(self.document, self._poll_spell_check), job)
+
+    def _finish_spell_check(self, interactive=True):
+        document = self.document
+        instrumentation.record("spell_check", time.perf_counter() - document._spell_check_started,
+                               occurrences=len(document.current_misspellings_list), completed=interactive)
+        document.spell_check_job = None
+        if self._is_selected():
+            self._update_edit_menu()
+        document.text_area.config(state=tk.NORMAL) # Editing stays possible during the interactive pass
+        if not interactive:
+            self._end_spell_session()
+            return
+
+        if not document.current_misspellings_list:
+            self._end_spell_session()
+            messagebox.showinfo("Spell Check", "No misspelled words found.", parent=self)
+            return
+
+        document.current_misspelling_index = 0
+        document.spell_session_active = True
+        if self._is_selected(): # Otherwise it starts when the tab is shown
+            self.spell_panel.open()
+            self._show_next_misspelling()
+
+    def _add_misspellings(self, items):
+        # Each occurrence's position is held by a pair of text marks rather than a fixed
+        # line.col string: Tk moves marks with every edit, so a replacement (or any other
+        # change) keeps all later positions valid without rescanning or re-sorting. The
+        # start mark has right gravity and the end mark left gravity, so text typed just
+        # before or after the word stays outside its range; _replace_misspellings sets
+        # both marks around the replacement itself.
+        # Chunks arrive in document order, so the list stays sorted by position.
+        document = self.document
+        mark_set = document.text_area.mark_set
+        mark_gravity = document.text_area.mark_gravity
+        for item in items:
+            name = f"{MISSPELLING_MARK_PREFIX}{document._misspelling_mark_count}"
+            document._misspelling_mark_count += 1
+            mark_set(name + "_start", item["start"])
+            mark_set(name + "_end", item["end"])
+            mark_gravity(name + "_end", tk.LEFT)
+            item["start"], item["end"] = name + "_start", name + "_end"
+            document.misspellings_by_word.setdefault(normalize_word(item["word"]), []).append(item)
+        document.current_misspellings_list.extend(items)
+        document.open_misspelling_count += len(items)
+
+    def _clear_misspelling_marks(self):
+        document = self.document
+        document.current_misspellings_list = []
+        document.misspellings_by_word = {}
+        document.open_misspelling_count = 0
+        names = [name for name in document.text_area.mark_names() if name.startswith(MISSPELLING_MARK_PREFIX)]
+        if names:
+            document.text_area.mark_unset(*names)
+
+    def cancel_spell_check(self):
+        if self.document.spell_check_job is None:
+            return
+        self.document.spell_check_job.cancel()
+        # Highlights found so far are kept; the interactive pass is skipped.
+        self._finish_spell_check(interactive=False)
+        messagebox.showinfo("Spell Check", "Spell check cancelled.", parent=self)
+
+    def _show_next_misspelling(self):
+        # Puts the next item needing attention in the spell check panel. The panel is
+        # non-modal: the session advances when _on_spell_panel_action reports a choice,
+        # and the document stays editable in between (the marks keep positions valid).
+        document = self.document
+        item = self._next_open_misspelling()
+        document.text_area.tag_remove("current_misspelling", "1.0", tk.END) # Clear previous "current" highlight
+        total = len(document.current_misspellings_list)
+        if item is None:
+            self.spell_panel.show_message("Spell check complete.", total)
+            return
+
+        misspelled_word = item["word"]
+        document.text_area.tag_add("current_misspelling", item["start"], item["end"])
+        document.text_area.tag_config("current_misspelling", background="orange", foreground="black")
+        document.text_area.see(item["start"]) # Scroll to the word
+
+        # Suggestions are only generated for the word being shown (and cached per session);
+        # the next few words are prepared in the background while it is on screen.
+        with instrumentation.timed("spell_check.suggestions", word=misspelled_word):
+            suggestions = self.spell_checker_util.get_suggestions(misspelled_word)
+        following = document.current_misspellings_list[document.current_misspelling_index + 1:
+                                                   document.current_misspelling_index + 1 + SUGGESTION_PREFETCH]
+        self.spell_checker_util.prefetch_suggestions([m["word"] for m in following])
+
+        self.spell_panel.show(misspelled_word, suggestions, document.open_misspelling_count, total)
+
+    def _on_spell_panel_action(self, action, word, replacement):
+        document = self.document
+        if action == "cancel": # Panel closed
+            self._end_spell_session()
+            return
+        if document.current_misspelling_index >= len(document.current_misspellings_list):
+            return
+        item = document.current_misspellings_list[document.current_misspelling_index]
+
+        if action == "replace":
+            if document.text_area.get(item["start"], item["end"]) != word:
+                # Edited while the panel showed it: keep the user's text and show the
+                # item again as it reads now (or move on if it is no longer misspelled)
+                self._show_next_misspelling()
+                return
+            self._replace_misspellings([item], replacement)
+        elif action == "replace_all":
+            self._replace_misspellings(self._open_occurrences(word, exact=True), replacement)
+        elif action == "ignore_once":
+            self._resolve_misspellings([item])
+        elif action == "ignore_all":
+            self.spell_checker_util.ignore_word(word)
+            self._resolve_misspellings(self._open_occurrences(word))
+        elif action == "add_to_dictionary":
+            self.spell_checker_util.add_to_dictionary(word)
+            self._resolve_misspellings(self._open_occurrences(word))
+        document.current_misspelling_index += 1
+        self._show_next_misspelling()
+
+    def _end_spell_session(self):
+        # Closes the panel; highlights of unresolved misspellings stay.
+        self.document.spell_session_active = False
+        if self._is_selected():
+            self.spell_panel.close()
+        self.document.text_area.tag_remove("current_misspelling", "1.0", tk.END)
+
+    def _next_open_misspelling(self):
+        # Advances current_misspelling_index to the next item still needing attention and
+        # returns it, or None at the end of the list.
+        document = self.document
+        while document.current_misspelling_index < len(document.current_misspellings_list):
+            item = document.current_misspellings_list[document.current_misspelling_index]
+            if not item.get("resolved"):
+                # The marks follow every edit, so this only differs if the word itself was
+                # edited. Show what is there now if it is still a misspelled word.
+                current_word_in_text = document.text_area.get(item["start"], item["end"])
+                if current_word_in_text == item["word"]:
+                    return item
+                if WORD_PATTERN.fullmatch(current_word_in_text) and self.spell_checker_util.is_misspelled(current_word_in_text):
+                    item["word"] = current_word_in_text
+                    occurrences = document.misspellings_by_word.setdefault(normalize_word(current_word_in_text), [])
+                    if not any(other is item for other in occurrences):
+                        occurrences.append(item)
+                    return item
+                item["resolved"] = True # No longer a misspelling
+                document.open_misspelling_count -= 1
+            document.current_misspelling_index += 1
+        return None
+
+    def _open_occurrences(self, word, exact=False):
+        # Unresolved occurrences of word, in document order. With exact, only those spelled
+        # exactly like it (so a replacement keeps each occurrence's capitalization choice);
+        # otherwise any case variant, like is_misspelled treats them.
+        key = normalize_word(word)
+        occurrences = []
+        for item in self.document.misspellings_by_word.get(key, []):
+            if item.get("resolved"):
+                continue
+            text = self.document.text_area.get(item["start"], item["end"])
+            if (text == word) if exact else (normalize_word(text) == key):
+                occurrences.append(item)
+        return occurrences
+
+    def _replace_misspellings(self, items, replacement):
+        # One pass from the back of the document to the front, as a single undo step.
+        document = self.document
+        document.text_area.config(autoseparators=False)
+        document.text_area.edit_separator()
+        try:
+            for item in reversed(items):
+                start = document.text_area.index(item["start"])
+                document.text_area.delete(start, item["end"])
+                document.text_area.insert(start, replacement)
+                document.text_area.mark_set(item["start"], start)
+                document.text_area.mark_set(item["end"], f"{start}+{len(replacement)}c")
+        finally:
+            document.text_area.edit_separator()
+            document.text_area.config(autoseparators=True)
+        # Remove the general "misspelled" tag for the corrected instances. Other
+        # occurrences need no adjustment: their marks moved with the edit.
+        self._resolve_misspellings(items)
+
+    def _resolve_misspellings(self, items):
+        for item in items:
+            if not item.get("resolved"):
+                item["resolved"] = True
+                self.document.open_misspelling_count -= 1
+        for i in range(0, len(items), TAG_BATCH_SIZE):
+            ranges = []
+            for item in items[i:i + TAG_BATCH_SIZE]:
+                ranges.extend((item["start"], item["end"]))
+            self.document.text_area.tag_remove("misspelled", *ranges)
+
+    def toggle_check_as_you_type(self):
+        if not self.check_as_you_type.get():
+            # Forget pending work; highlights already shown stay until the next full check.
+            self.document.dirty_lines.pop_all()
+            if self.document._recheck_after_id is not None:
+                self.after_cancel(self.document._recheck_after_id)
+                self.document._recheck_after_id = None
+
+    def _on_text_change(self, line, removed, added):
+        document = self.document
+        if not self.check_as_you_type.get() or document.file_loader is not None or document.mapped_file is not None:
+            return
+        document.dirty_lines.record_edit(line, removed, added)
+        # Debounce: re-check once typing pauses rather than on every keystroke.
+        if document._recheck_after_id is not None:
+            self.after_cancel(document._recheck_after_id)
+        document._recheck_after_id = self.after(RECHECK_DELAY_MS, self._bind_document(document, self._recheck_dirty_lines))
+
+    def _recheck_dirty_lines(self):
+        document = self.document
+        document._recheck_after_id = None
+        if document.spell_check_job is not None: # A full check is running and will cover these lines
+            document.dirty_lines.pop_all()
+            return
+        if not self._is_selected(): # Kept until the tab is shown again
+            return
+        # Only the edited lines are re-scanned, so the cost follows the size of the edit.
+        document.misspelling_highlights_active = True
+        last_line = int(document.text_area.index("end-1c").split('.')[0])
+        ranges = document.dirty_lines.pop_all()
+        with instrumentation.timed("recheck_dirty_lines", ranges=len(ranges)):
+            for first, last in ranges:
+                if first <= last_line:
+                    self._tag_misspellings(first, min(last, last_line))
+
+    def _add_tag_ranges(self, tag, ranges):
+        # One tag_add call for a flat [start, end, start, end, ...] list of indices
+        self.document.text_area.tag_add(tag, *ranges)
+        instrumentation.count("tags_added", len(ranges) // 2)
+
+    def _tag_misspellings(self, first_line, last_line):
+        # (Re)computes "misspelled" tags for whole lines first_line..last_line.
+        start_pos, end_pos = f"{first_line}.0", f"{last_line}.end"
+        self.document.text_area.tag_remove("misspelled", start_pos, end_pos)
+        content = self._prose_window(first_line, last_line)
+        ranges = []
+        for word, line, char in self.spell_checker_util.scan_misspellings(content, first_line):
+            ranges.extend((f"{line}.{char}", f"{line}.{char + len(word)}"))
+            if len(ranges) >= 2 * TAG_BATCH_SIZE:
+                self._add_tag_ranges("misspelled", ranges)
+                ranges = []
+        if ranges:
+            self._add_tag_ranges("misspelled", ranges)
+
+    def _prose_window(self, first_line, last_line):
+        # Lines first_line..last_line with everything but their prose blanked out (see
+        # utils/tokenizers.py). For HTML the lines around them are read too, so a tag,
+        # comment or <style>/<script> element crossing the window's edges is recognised
+        # as it is by a full check. In the viewer they come from the mapped file.
+        document = self.document
+        content = document.text_area.get(f"{first_line}.0", f"{last_line}.end")
+        if document.tokenizer not in WINDOW_CONTEXT:
+            return mask_window(content, document.tokenizer)
+        if document.mapped_file is not None:
+            first = document.viewer_first_line + first_line - 1 # 0-based file lines
+            last = document.viewer_first_line + last_line - 1
+            context_first = max(first - TOKENIZER_CONTEXT_LINES, 0)
+            before = document.mapped_file.read_lines(context_first, first - context_first)
+            after = "\n" + document.mapped_file.read_lines(last + 1, TOKENIZER_CONTEXT_LINES)
+        else:
+            before = document.text_area.get(f"{max(first_line - TOKENIZER_CONTEXT_LINES, 1)}.0", f"{first_line}.0")
+            after = document.text_area.get(f"{last_line}.end", f"{last_line + TOKENIZER_CONTEXT_LINES}.end")
+        return mask_window(content, document.tokenizer, before, after)
+
+    def _tag_spaces(self, first_line, last_line):
+        # (Re)computes "space" tags for whole lines first_line..last_line. Each run of
+        # spaces is tagged as one range, which looks the same as tagging every space.
+        start_pos, end_pos = f"{first_line}.0", f"{last_line}.end"
+        self.document.text_area.tag_remove("space", start_pos, end_pos)
+        content = self.document.text_area.get(start_pos, end_pos)
+        ranges = []
+        for line, start_char, end_char in iter_space_runs(content, first_line):
+            ranges.extend((f"{line}.{start_char}", f"{line}.{end_char}"))
+            if len(ranges) >= 2 * TAG_BATCH_SIZE:
+                self._add_tag_ranges("space", ranges)
+                ranges = []
+        if ranges:
+            self._add_tag_ranges("space", ranges)
+
+    def toggle_viewport_highlighting(self):
+        document = self.document
+        if self.viewport_highlighting.get():
+            # Drop document-wide highlights; from now on only the visible lines carry tags.
+            document.text_area.tag_remove("space", "1.0", tk.END)
+            document.text_area.tag_remove("misspelled", "1.0", tk.END)
+            document._viewport_lines = None
+            self._refresh_viewport_highlights()
+            return
+
+        document._viewport_lines = None
+        if document._viewport_after_id is not None:
+            self.after_cancel(document._viewport_after_id)
+            document._viewport_after_id = None
+        # Back to whole-document highlighting
+        if document.highlight_spaces:
+            self._apply_space_highlighting()
+        if document.misspelling_highlights_active:
+            self._tag_misspelling_list()
+
+    def _tag_misspelling_list(self, first_line=None, last_line=None):
+        # Tags the unresolved occurrences of the last check from their marks, no rescan;
+        # all of them, or those starting on lines first_line..last_line
+        items = self.document.current_misspellings_list
+        if first_line is not None:
+            items = self._misspellings_in_lines(first_line, last_line)
+        ranges = []
+        for item in items:
+            if not item.get("resolved"):
+                ranges.extend((item["start"], item["end"]))
+        for i in range(0, len(ranges), 2 * TAG_BATCH_SIZE):
+            self._add_tag_ranges("misspelled", ranges[i:i + 2 * TAG_BATCH_SIZE])
+
+    def _misspellings_in_lines(self, first_line, last_line):
+        # The marks keep the list in document order through any edit, so the items on
+        # the given lines are found by bisection rather than by indexing every mark.
+        items = self.document.current_misspellings_list
+        def line_of(item):
+            return int(self.document.text_area.index(item["start"]).split('.')[0])
+        low, high = 0, len(items)
+        while low < high:
+            middle = (low + high) // 2
+            if line_of(items[middle]) < first_line:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        for item in items[low:]:
+            if line_of(item) > last_line:
+                break
+            found.append(item)
+        return found
+
+    def _on_text_yscroll(self, first, last):
+        if self.document.mapped_file is not None:
+            self._viewer_on_yscroll()
+        else:
+            self.document.text_area.vbar.set(first, last)
+        self._schedule_viewport_refresh()
+
+    def _schedule_viewport_refresh(self):
+        # Hidden tabs do no highlighting work; they are refreshed when shown
+        document = self.document
+        if not self.viewport_highlighting.get() or document._viewport_after_id is not None or not self._is_selected():
+            return
+        document._viewport_after_id = self.after(VIEWPORT_REFRESH_MS,
+                                                 self._bind_document(document, self._refresh_viewport_highlights))
+
+    def _visible_line_range(self):
+        first = int(self.document.text_area.index("@0,0").split('.')[0])
+        last = int(self.document.text_area.index(f"@0,{self.document.text_area.winfo_height()}").split('.')[0])
+        last_line = int(self.document.text_area.index("end-1c").split('.')[0])
+        return max(first - VIEWPORT_MARGIN_LINES, 1), min(last + VIEWPORT_MARGIN_LINES, last_line)
+
+    def _refresh_viewport_highlights(self):
+        # Tags exist only for the visible lines plus a margin, so the number of tag ranges
+        # (and the memory and redraw cost that comes with them) follows the window size.
+        document = self.document
+        document._viewport_after_id = None
+        if not self.viewport_highlighting.get():
+            return
+        first, last = self._visible_line_range()
+        if document._viewport_lines is not None:
+            old_first, old_last = document._viewport_lines
+            document.text_area.tag_remove("space", f"{old_first}.0", f"{old_last}.end")
+            document.text_area.tag_remove("misspelled", f"{old_first}.0", f"{old_last}.end")
+        document._viewport_lines = (first, last)
+
+        with instrumentation.timed("viewport_highlighting", lines=last - first + 1):
+            if document.highlight_spaces:
+                self._tag_spaces(first, last)
+            if (document.misspelling_highlights_active and document.current_misspellings_list
+                    and document.spell_check_job is None):
+                # From the last check's marks, so occurrences resolved in the spell check
+                # panel (Ignore Once, Replace, ...) stay untagged when scrolled back into view
+                self._tag_misspelling_list(first, last)
+            elif document.misspelling_highlights_active:
+                # No complete check to go by (check as you type, a check still running,
+                # or the viewer): scan the lines
+                self._tag_misspellings(first, last)
+
+    def toggle_highlight_spaces(self):
+        self.document.highlight_spaces = self.highlight_spaces_active.get()
+        if self.document.highlight_spaces:
+            self._apply_space_highlighting()
+        else:
+            self.document.text_area.tag_remove("space", "1.0", tk.END)
+            # If spell check highlighting was active, it might be good to re-apply it here.
+            # For now, this just removes space highlights.
+            # Users might need to re-run spell check if they want its highlights back immediately.
+
+    def _apply_space_highlighting(self):
+        # It's important to remove old "space" tags first, 
+        # otherwise, if text is deleted, old highlights might remain.
+        self.document.text_area.tag_remove("space", "1.0", tk.END)
+
+        if self.viewport_highlighting.get():
+            self.document._viewport_lines = None
+            self._refresh_viewport_highlights()
+            return
+
+        # One pass over the content instead of one Text.search call per space
+        last_line = int(self.document.text_area.index("end-1c").split('.')[0])
+        with instrumentation.timed("space_highlighting", lines=last_line):
+            self._tag_spaces(1, last_line)
+
+        # After applying space highlights, ensure that misspelled word highlights are still visible
+        # if spell check is active. This can be tricky due to tag overlaps.
+        # One approach is to re-apply the "misspelled" tag to words that are already known to be misspelled.
+        # Or, ensure "misspelled" tag has higher priority if Tkinter supports it directly (it doesn't simply).
+        # For now, the current spell_check_text method already handles re-applying space highlights
+        # if space highlighting is active when spell_check_text is called.
+        # And toggle_highlight_spaces just focuses on space tags.
+
+    def delete_all_spaces(self):
+        if self.document.mapped_file is not None:
+            print("The large-file viewer is read-only; spaces cannot be deleted.")
+            return
+        last_line = int(self.document.text_area.index("end-1c").split('.')[0])
+        with instrumentation.timed("delete_whitespace", lines=last_line) as fields:
+            fields["runs"] = deleted = self._delete_whitespace(1, last_line)
+        if deleted:
+            print(f"Deleted {deleted} whitespace runs in the document.")
+        else:
+            print("No spaces found to delete in the document.")
+
+    def _delete_whitespace(self, first_line, last_line, mode=None):
+        # Finds the runs of the selected kind of whitespace in one pass and deletes just
+        # those characters, so the undo history, tags outside the runs and the insert
+        # mark all survive. Returns the number of runs deleted.
+        document = self.document
+        content = document.text_area.get(f"{first_line}.0", f"{last_line}.end")
+        runs = find_whitespace_runs(content, mode or self.whitespace_mode.get(), first_line)
+        if not runs:
+            return 0
+
+        # Back to front, several ranges per delete call: earlier indices stay valid, and
+        # the whole operation is one undo step.
+        document.text_area.config(autoseparators=False)
+        document.text_area.edit_separator()
+        try:
+            for batch_end in range(len(runs), 0, -DELETE_BATCH_SIZE):
+                indices = []
+                for line, start_char, end_char in reversed(runs[max(batch_end - DELETE_BATCH_SIZE, 0):batch_end]):
+                    indices.extend((f"{line}.{start_char}", f"{line}.{end_char}"))
+                document.text_area.tk.call(document.text_area._w, "delete", *indices)
+        finally:
+            document.text_area.edit_separator()
+            document.text_area.config(autoseparators=True)
+        return len(runs)
+
+    def delete_spaces_in_selected_lines(self):
+        if self.document.mapped_file is not None:
+            print("The large-file viewer is read-only; spaces cannot be deleted.")
+            return
+        try:
+            start_sel = self.document.text_area.index(tk.SEL_FIRST)
+            end_sel = self.document.text_area.index(tk.SEL_LAST)
+            
+            # Get the line numbers for the selection
+            start_line = int(start_sel.split('.')[0])
+            end_line = int(end_sel.split('.')[0])
+
+            # Whole lines from start_line to end_line (inclusive) are cleaned, wherever the
+            # selection starts and ends within them.
+            deleted = self._delete_whitespace(start_line, end_line)
+            if deleted:
+                print(f"Deleted spaces in lines {start_line} to {end_line}.")
+            else:
+                print(f"No spaces found to delete in lines {start_line} to {end_line}.")
+
+        except tk.TclError:
+            print("No text selected, or selection is invalid for deleting spaces in lines.")
+            # This occurs if SEL_FIRST or SEL_LAST don't exist (no selection)
@@ -0,0 +1,198 @@
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+# Keyboard shortcuts, bound on the whole window so they also work while typing in the
+# text area. Alt combinations leave ordinary typing alone.
+SHORTCUTS = {
+    "replace": "<Alt-r>",
+    "replace_all": "<Alt-a>",
+    "ignore_once": "<Alt-i>",
+    "ignore_all": "<Alt-g>",
+    "add_to_dictionary": "<Alt-d>",
+}
+
+
+class SpellCheckPanel(tk.Frame):
+    # Side panel for the interactive spell check pass. It is built once and updated in
+    # place for each misspelling (show), and it does not grab input, so the document
+    # can be edited while it is open. It is docked to the side of the window by default
+    # and can be floated into its own window and docked back.
+    #
+    # Actions are reported through on_action(action, word, replacement), with action
+    # one of the SHORTCUTS keys; closing the panel reports on_action("cancel", None, None).
+    def __init__(self, parent, on_action, dock_options=None):
+        super().__init__(parent, borderwidth=1, relief=tk.GROOVE)
+        self.on_action = on_action
+        self.dock_options = dock_options or {"side": tk.RIGHT, "fill": tk.Y}
+        self.misspelled_word = None
+        self.suggestions = []
+        self.floating = False
+
+        header = ttk.Frame(self)
+        header.pack(fill=tk.X, padx=5, pady=(5, 0))
+        ttk.Label(header, text="Spell Check", font=("Arial", 10, "bold")).pack(side=tk.LEFT)
+        ttk.Button(header, text="✕", width=3, command=self.on_cancel).pack(side=tk.RIGHT)
+        self.float_button = ttk.Button(header, text="Float", width=6, command=self.toggle_floating)
+        self.float_button.pack(side=tk.RIGHT, padx=2)
+
+        tk.Label(self, text="Misspelled Word:").pack(anchor="w", padx=5, pady=(5, 0))
+        self.word_label = tk.Label(self, font=("Arial", 10, "bold"), foreground="red", anchor="w")
+        self.word_label.pack(fill=tk.X, padx=5)
+        self.count_label = tk.Label(self, anchor="w")
+        self.count_label.pack(fill=tk.X, padx=5, pady=(0, 5))
+
+        tk.Label(self, text="Suggestions:").pack(anchor="w", padx=5)
+        self.suggestions_listbox = tk.Listbox(self, selectmode=tk.SINGLE, exportselection=False, height=8)
+        self.suggestions_listbox.pack(fill=tk.BOTH, expand=True, padx=5, pady=(0, 5))
+        self.suggestions_listbox.bind("<Double-Button-1>", lambda event: self.on_replace())
+        self.suggestions_listbox.bind("<Return>", lambda event: self.on_replace())
+        self.suggestions_listbox.bind("<Escape>", lambda event: self.on_cancel())
+
+        # Buttons
+        self.buttons = []
+        for label, command in (("Replace (Alt+R)", self.on_replace),
+                               ("Replace All (Alt+A)", self.on_replace_all),
+                               ("Ignore Once (Alt+I)", self.on_ignore_once),
+                               ("Ignore All (Alt+G)", self.on_ignore_all),
+                               ("Add to Dictionary (Alt+D)", self.on_add_to_dictionary)):
+            button = ttk.Button(self, text=label, command=command)
+            button.pack(fill=tk.X, padx=5, pady=1)
+            self.buttons.append(button)
+
+        toplevel = parent.winfo_toplevel()
+        for action, sequence in SHORTCUTS.items():
+            toplevel.bind(sequence, lambda event, action=action: self._on_shortcut(action), add="+")
+
+    def open(self):
+        # Shows the panel (docked unless it was floated) without taking the focus.
+        if self.floating:
+            self.tk.call("wm", "deiconify", self._w)
+        elif not self.winfo_manager(): # winfo_ismapped would also be false while the window is hidden
+            self.pack(**self.dock_options)
+
+    def is_open(self):
+        # Shown, or at least not closed: docked, or floating and not withdrawn
+        if self.floating:
+            return self.tk.call("wm", "state", self._w) != "withdrawn"
+        return bool(self.winfo_manager())
+
+    def close(self):
+        if self.floating:
+            self.tk.call("wm", "withdraw", self._w)
+        else:
+            self.pack_forget()
+        self.misspelled_word = None
+
+    def toggle_floating(self):
+        # Tk's "wm manage" turns the frame into a top-level window and "wm forget"
+        # turns it back, so the same widgets are reused either way.
+        if self.floating:
+            self.tk.call("wm", "forget", self._w)
+            self.floating = False
+            self.float_button.config(text="Float")
+            self.pack(**self.dock_options)
+        else:
+            self.pack_forget()
+            self.tk.call("wm", "manage", self._w)
+            self.tk.call("wm", "title", self._w, "Spell Check")
+            self.tk.call("wm", "protocol", self._w, "WM_DELETE_WINDOW", self.register(self.on_cancel))
+            self.floating = True
+            self.float_button.config(text="Dock")
+
+    def show(self, misspelled_word, suggestions, remaining, total):
+        # Updates the panel in place for the next misspelling.
+        self.misspelled_word = misspelled_word
+        self.suggestions = suggestions
+        self.word_label.config(text=misspelled_word)
+        self.count_label.config(text=f"{remaining} of {total} remaining")
+        self.suggestions_listbox.delete(0, tk.END)
+        if suggestions:
+            self.suggestions_listbox.insert(tk.END, *suggestions)
+            self.suggestions_listbox.select_set(0) # Select the first suggestion by default
+            self.suggestions_listbox.activate(0)
+        else:
+            self.suggestions_listbox.insert(tk.END, "(no suggestions)")
+        self._set_buttons_state(tk.NORMAL)
+
+    def show_message(self, message, total=None):
+        # No current word, e.g. while the check runs or once every item is handled.
+        self.misspelled_word = None
+        self.suggestions = []
+        self.word_label.config(text="")
+        self.count_label.config(text=message if total is None else f"{message} ({total} found)")
+        self.suggestions_listbox.delete(0, tk.END)
+        self._set_buttons_state(tk.DISABLED)
+
+    def _set_buttons_state(self, state):
+        for button in self.buttons:
+            button.config(state=state)
+
+    def _on_shortcut(self, action):
+        if self.misspelled_word is None: # Panel closed or nothing to act on
+            return None
+        {"replace": self.on_replace,
+         "replace_all": self.on_replace_all,
+         "ignore_once": self.on_ignore_once,
+         "ignore_all": self.on_ignore_all,
+         "add_to_dictionary": self.on_add_to_dictionary}[action]()
+        return "break" # Keep the key from reaching the text area or the menu bar
+
+    def _selected_replacement(self):
+        if not self.suggestions:
+            messagebox.showwarning("No Suggestion", "No suggestions available to replace with.", parent=self)
+            return None
+        selection = self.suggestions_listbox.curselection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Please select a suggestion to replace with.", parent=self)
+            return None
+        return self.suggestions_listbox.get(selection[0])
+
+    def _report(self, action, replacement=None):
+        if self.misspelled_word is None:
+            return
+        self.on_action(action, self.misspelled_word, replacement)
+
+    def on_replace(self):
+        replacement = self._selected_replacement()
+        if replacement is not None:
+            self._report("replace", replacement)
+
+    def on_replace_all(self):
+        # Every remaining occurrence of the word, applied by the editor as one edit
+        replacement = self._selected_replacement()
+        if replacement is not None:
+            self._report("replace_all", replacement)
+
+    def on_ignore_once(self):
+        self._report("ignore_once")
+
+    def on_ignore_all(self):
+        self._report("ignore_all")
+
+    def on_add_to_dictionary(self):
+        self._report("add_to_dictionary")
+
+    def on_cancel(self):
+        self.on_action("cancel", None, None)
+
+
+if __name__ == '__main__':
+    # Example usage (for testing the panel independently)
+    root = tk.Tk()
+    root.title("Main Application Window")
+    root.geometry("600x400")
+    text = tk.Text(root)
+    words = [("mispeled", ["misspelled", "misspell", "misapplied"]), ("teh", ["the", "ten", "tea"])]
+
+    def on_action(action, word, replacement=None):
+        print(f"Panel action: {action} {word} {replacement}")
+        if action == "cancel" or not words:
+            panel.close()
+            return
+        panel.show(*words.pop(0), remaining=len(words) + 1, total=2)
+
+    panel = SpellCheckPanel(root, on_action, dock_options={"side": tk.RIGHT, "fill": tk.Y, "before": text})
+    text.pack(expand=True, fill="both")
+    panel.open()
+    panel.show(*words.pop(0), remaining=2, total=2)
+    root.mainloop()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from utils.dictionary_cache import load_dictionary
+from utils.file_io import ChunkedFileLoader, atomic_write, FSYNC_POLICIES
+from utils.spell_checker import SpellCheckerUtil
+from utils.tokenizers import TOKENIZERS, tokenizer_for_path
+from utils.whitespace import WHITESPACE_PATTERNS, delete_runs, find_whitespace_runs
+
+# Files picked up when a directory is given on the command line
+DEFAULT_EXTENSIONS = (".txt", ".html", ".htm", ".json", ".md")
+# Files handed to a worker process at a time; amortizes the inter-process round trip
+# over several small files while still spreading the work evenly.
+POOL_CHUNK_SIZE = 8
+
+# Per-process SpellCheckerUtil, set up once by _init_worker. Opening the compiled
+# dictionary only maps the file, so every worker shares the same pages of the OS
+# file cache instead of loading its own copy of the word list.
+_spell_checker_util = None
+
+
+def iter_files(paths, extensions=DEFAULT_EXTENSIONS):
+    # Files given directly, plus the files with a matching extension under any given
+    # directory, in a stable (sorted) order.
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(root, name)
+
+
+def read_text(path):
+    # Same decoding and newline handling as opening the file in the editor
+    return "".join(text for text, _ in ChunkedFileLoader(path).iter_chunks())
+
+
+def _init_worker(cache_dir=None, user_dictionary_path=None):
+    global _spell_checker_util
+    _spell_checker_util = SpellCheckerUtil(cache_dir=cache_dir, user_dictionary_path=user_dictionary_path)
+
+
+def check_file(path, suggestions=False, file_format="auto"):
+    # Misspellings in one file, found by the same scan the editor runs, as a JSON-ready
+    # dict. file_format picks the tokenizer: "auto" by extension like the editor, a
+    # TOKENIZERS key, or "none" for the raw text. Errors are reported in the result
+    # rather than raised, so one unreadable file does not stop a batch.
+    if file_format == "auto":
+        tokenizer = tokenizer_for_path(path)
+    else:
+        tokenizer = TOKENIZERS.get(file_format)
+    try:
+        content = read_text(path)
+        misspellings = []
+        for word, line, column in _spell_checker_util.scan_misspellings(content, tokenizer=tokenizer):
+            item = {"word": word, "line": line, "column": column}
+            if suggestions:
+                item["suggestions"] = _spell_checker_util.get_suggestions(word)
+            misspellings.append(item)
+        return {"path": path, "misspellings": misspellings}
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def strip_file(path, mode="trailing", dry_run=False, fsync="file"):
+    # Deletes runs of the given kind of whitespace (see WHITESPACE_PATTERNS) from one
+    # file, writing it atomically with its own line endings; with dry_run the runs are
+    # only counted.
+    try:
+        loader = ChunkedFileLoader(path)
+        content = "".join(text for text, _ in loader.iter_chunks())
+        runs = find_whitespace_runs(content, mode)
+        result = {"path": path, "runs": len(runs)}
+        if runs and not dry_run:
+            result["bytes_written"] = atomic_write(path, [delete_runs(content, runs)], fsync=fsync,
+                                                   newline=loader.newline)
+        return result
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def run_batch(func, files, jobs=None, cache_dir=None, user_dictionary_path=None):
+    # Yields func(path) for every path, in order, computed on a pool of `jobs` worker
+    # processes (all CPUs by default; 1 runs in this process).
+    initargs = (cache_dir, user_dictionary_path)
+    if jobs == 1:
+        _init_worker(*initargs)
+        for path in files:
+            yield func(path)
+        return
+    # Build the compiled dictionary once up front, so the workers only open it.
+    load_dictionary(cache_dir=cache_dir).close()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+        yield from executor.map(func, files, chunksize=POOL_CHUNK_SIZE)
+
+
+def positive_int(text):
+    # argparse type for --jobs: a usage error rather than ProcessPoolExecutor's ValueError
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, not {value}")
+    return value
+
+
+def add_arguments(subparsers):
+    # Adds the "check" and "strip-spaces" commands to an argparse subparsers object.
+    check = subparsers.add_parser("check", help="spell check files and print misspellings as JSON lines")
+    check.add_argument("--suggestions", action="store_true", help="include suggestions for each misspelling")
+    check.add_argument("--format", dest="file_format", choices=("auto", "none", *TOKENIZERS), default="auto",
+                       help="which parts of each file to check (default: by file extension)")
+    strip = subparsers.add_parser("strip-spaces", help="delete whitespace runs from files in place")
+    # Trailing whitespace by default: the other modes also delete the spaces between
+    # words, which a bulk run over a tree should only do when asked for explicitly.
+    strip.add_argument("--mode", choices=sorted(WHITESPACE_PATTERNS), default="trailing",
+                       help="kind of whitespace to delete (default: trailing)")
+    strip.add_argument("--dry-run", action="store_true", help="only count the runs that would be deleted")
+    strip.add_argument("--fsync", choices=FSYNC_POLICIES, default="file", help="how durably to write each file")
+    for parser in (check, strip):
+        parser.add_argument("paths", nargs="+", help="files, or directories to search")
+        parser.add_argument("--jobs", "-j", type=positive_int, default=None, help="worker processes (default: all CPUs)")
+        parser.add_argument("--ext", action="append", help=f"file extension to include from directories (default: {' '.join(DEFAULT_EXTENSIONS)})")
+
+
+def run_command(args):
+    # Runs a parsed "check" or "strip-spaces" command, streaming one JSON line per file
+    # to stdout. Exit status: 2 if any file failed, 1 if check found misspellings (or a
+    # strip-spaces dry run found whitespace), 0 otherwise.
+    extensions = tuple(ext if ext.startswith(".") else f".{ext}" for ext in args.ext) if args.ext else DEFAULT_EXTENSIONS
+    files = list(iter_files(args.paths, extensions))
+    if args.command == "check":
+        func = partial(check_file, suggestions=args.suggestions, file_format=args.file_format)
+        found_key = "misspellings"
+    else:
+        func = partial(strip_file, mode=args.mode, dry_run=args.dry_run, fsync=args.fsync)
+        found_key = "runs"
+
+    start = time.perf_counter()
+    found = errors = 0
+    for result in run_batch(func, files, args.jobs):
+        print(json.dumps(result), flush=True)
+        if "error" in result:
+            errors += 1
+        else:
+            count = result[found_key]
+            found += count if isinstance(count, int) else len(count)
+    print(f"{len(files)} files, {found} {found_key}, {errors} errors in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    if errors:
+        return 2
+    return 1 if found and (args.command == "check" or args.dry_run) else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch spell check and whitespace cleanup.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_arguments(subparsers)
+    return run_command(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+
+# Compiled dictionary file (little-endian), built once from pyspellchecker's word list
+# and memory-mapped on every later start instead of decompressing and parsing its JSON:
+#
+#   header   magic, format version, slot count, word count, letters length, source length
+#   letters  UTF-8 alphabet used to generate suggestion candidates
+#   source   UTF-8 id of the word list it was built from (e.g. "pyspellchecker-0.9.1-en")
+#   slots    open-addressing hash table: slot_count x (word offset u32, frequency u32),
+#            indexed by crc32(word) with linear probing; EMPTY_SLOT marks a free slot
+#   words    (length u16, UTF-8 bytes) records the slots point into
+MAGIC = b"TEDICT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<6sHIIII")
+_SLOT = struct.Struct("<II")
+_LENGTH = struct.Struct("<H")
+EMPTY_SLOT = 0xFFFFFFFF
+
+
+def default_cache_dir():
+    # Rebuildable data: the compiled dictionary.
+    if os.environ.get("TEXTEDITOR_CACHE_DIR"):
+        return os.environ["TEXTEDITOR_CACHE_DIR"]
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "TextEditor", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/TextEditor")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "texteditor")
+
+
+def default_config_dir():
+    # User data that must not be thrown away: the user dictionary.
+    if os.environ.get("TEXTEDITOR_CONFIG_DIR"):
+        return os.environ["TEXTEDITOR_CONFIG_DIR"]
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get("APPDATA", os.path.expanduser("~")), "TextEditor")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support/TextEditor")
+    return os.path.join(os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config")), "texteditor")
+
+
+def build_dictionary(path, frequencies, source=""):
+    # Writes a compiled dictionary for the {word: frequency} mapping to path. The file
+    # is written to a temporary name and renamed, so a concurrent reader never sees a
+    # partial file.
+    words = [word.encode("utf-8") for word in frequencies]
+    slot_count = 1
+    while slot_count < 2 * len(words): # Load factor <= 0.5 keeps probe chains short
+        slot_count *= 2
+    letters = "".join(sorted({char for word in frequencies for char in word})).encode("utf-8")
+    source = source.encode("utf-8")
+
+    slots = [(EMPTY_SLOT, 0)] * slot_count
+    blob = bytearray()
+    for word, frequency in zip(words, frequencies.values()):
+        slot = zlib.crc32(word) & (slot_count - 1)
+        while slots[slot][0] != EMPTY_SLOT:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = (len(blob), min(max(frequency, 1), 0xFFFFFFFF))
+        blob += _LENGTH.pack(len(word)) + word
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with open(fd, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, slot_count, len(words), len(letters), len(source)))
+            f.write(letters)
+            f.write(source)
+            f.write(b"".join(_SLOT.pack(*slot) for slot in slots))
+            f.write(blob)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+class CompiledDictionary:
+    # Read-only, memory-mapped view of a file written by build_dictionary. Lookups hash
+    # the word and probe the slot table in place; nothing is loaded up front, so opening
+    # it costs the same for ten words or a million.
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self._slot_count, self._word_count, letters_length, source_length = _HEADER.unpack_from(self._map, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                raise ValueError(f"{path} is not a compiled dictionary of format {FORMAT_VERSION}")
+            offset = _HEADER.size
+            self._slots_offset = offset + letters_length + source_length
+            self._words_offset = self._slots_offset + self._slot_count * _SLOT.size
+            # A truncated file (e.g. a partial copy) would otherwise only fail on lookup,
+            # in the middle of a spell check
+            if len(self._map) < self._words_offset + (_LENGTH.size if self._word_count else 0):
+                raise ValueError(f"{path} is truncated")
+            self.letters = self._map[offset:offset + letters_length].decode("utf-8")
+            offset += letters_length
+            self.source = self._map[offset:offset + source_length].decode("utf-8")
+        except Exception:
+            if hasattr(self, "_map"):
+                self._map.close()
+            self._file.close()
+            raise
+
+    def __len__(self):
+        return self._word_count
+
+    def frequency(self, word):
+        # Frequency of word in the source word list, 0 if it is not in the dictionary.
+        key = word.encode("utf-8")
+        mask = self._slot_count - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            word_offset, frequency = _SLOT.unpack_from(self._map, self._slots_offset + slot * _SLOT.size)
+            if word_offset == EMPTY_SLOT:
+                return 0
+            start = self._words_offset + word_offset
+            length = _LENGTH.unpack_from(self._map, start)[0]
+            if length == len(key) and self._map[start + _LENGTH.size:start + _LENGTH.size + length] == key:
+                return frequency
+            slot = (slot + 1) & mask
+
+    def __contains__(self, word):
+        return self.frequency(word) > 0
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def load_dictionary(language="en", cache_dir=None):
+    # Opens the compiled dictionary for language, building it from pyspellchecker's word
+    # list the first time (or when pyspellchecker has been upgraded since).
+    path = os.path.join(cache_dir or default_cache_dir(), f"{language}.dict")
+    try:
+        import spellchecker
+        source = f"pyspellchecker-{spellchecker.__version__}-{language}"
+    except ImportError: # Frozen builds may ship only the cache
+        spellchecker = None
+        source = None
+
+    if os.path.exists(path):
+        try:
+            dictionary = CompiledDictionary(path)
+            if source is None or dictionary.source == source:
+                return dictionary
+            dictionary.close()
+        except (OSError, ValueError, struct.error) as e:
+            # stderr: stdout may be the JSON-lines output of the check command
+            print(f"Rebuilding dictionary cache {path}: {e}", file=sys.stderr)
+    if spellchecker is None:
+        raise RuntimeError(f"No dictionary cache at {path} and pyspellchecker is not installed to build one")
+
+    frequencies = spellchecker.SpellChecker(language=language).word_frequency.dictionary
+    build_dictionary(path, frequencies, source)
+    return CompiledDictionary(path)
+
+
+class UserDictionary:
+    # Words added with "Add to Dictionary": a plain text file, one word per line, held in
+    # a set for O(1) lookups. Additions are appended to the file immediately.
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_config_dir(), "user_words.txt")
+        self.words = set()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.words = {line.strip().lower() for line in f if line.strip()}
+        except FileNotFoundError:
+            pass
+
+    def __contains__(self, word):
+        return word.lower() in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+    def add(self, word):
+        word = word.strip().lower()
+        if not word or word in self.words:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(word + "\n")
+        self.words.add(word)
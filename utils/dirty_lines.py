@@ -0,0 +1,53 @@
+import bisect
+
+
+class DirtyLineRanges:
+    # Sorted, merged list of edited line ranges [(first, last), ...] (1-based, inclusive).
+    # Ranges are kept in sync with later edits by shift() so that, when they are finally
+    # re-checked, they still point at the lines that were changed.
+    def __init__(self):
+        self._ranges = []
+
+    def __bool__(self):
+        return bool(self._ranges)
+
+    def __iter__(self):
+        return iter(self._ranges)
+
+    def mark(self, first, last):
+        ranges = self._ranges
+        i = bisect.bisect_left(ranges, (first, first))
+        if i > 0 and ranges[i - 1][1] >= first - 1: # Previous range overlaps or is adjacent
+            i -= 1
+        j = i
+        while j < len(ranges) and ranges[j][0] <= last + 1:
+            first, last = min(first, ranges[j][0]), max(last, ranges[j][1])
+            j += 1
+        ranges[i:j] = [(first, last)]
+
+    def shift(self, line, delta):
+        # Lines after `line` moved by `delta` (negative when lines were removed). Lines in
+        # the removed span (line, line - delta] collapse onto `line`.
+        if not delta or not self._ranges:
+            return
+
+        def move(x):
+            if x <= line:
+                return x
+            if x <= line - delta: # Only possible when delta < 0
+                return line
+            return x + delta
+
+        ranges, self._ranges = self._ranges, []
+        for a, b in ranges:
+            self.mark(move(a), move(b))
+
+    def record_edit(self, line, removed, added):
+        # An edit starting on `line` replaced `removed` line breaks with `added` ones.
+        self.shift(line, -removed)
+        self.shift(line, added)
+        self.mark(line, line + added)
+
+    def pop_all(self):
+        ranges, self._ranges = self._ranges, []
+        return ranges
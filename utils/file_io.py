@@ -0,0 +1,162 @@
+import codecs
+import io
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from utils import instrumentation
+
+# The first chunk is small so the first screenful can be shown right away; the rest of
+# the file is read in larger chunks to keep the number of widget inserts down.
+FIRST_CHUNK_SIZE = 64 * 1024
+CHUNK_SIZE = 1024 * 1024
+# Decoded chunks waiting for the UI. Bounds memory when the UI falls behind the disk.
+MAX_PENDING_CHUNKS = 8
+
+# How hard atomic_write works to make a save durable:
+#   "none" - leave flushing to the OS (fastest; a power loss may lose the new contents)
+#   "file" - fsync the new file before it replaces the old one
+#   "full" - also fsync the directory so the rename itself is on disk (POSIX only)
+FSYNC_POLICIES = ("none", "file", "full")
+# Line endings a file can use; text is always \n in memory and written back with one
+# of these (see ChunkedFileLoader.newline and atomic_write).
+NEWLINES = ("\n", "\r\n", "\r")
+
+
+class ChunkedFileLoader:
+    # Reads a text file on a background thread in fixed-size chunks. Decoding is
+    # incremental, so multi-byte UTF-8 sequences and \r\n pairs split across chunk
+    # boundaries are handled, and line endings are translated to \n like open() does.
+    # The endings are counted on the way, so the file can be saved with its own style.
+    #
+    # Results are posted to `self.results` as (kind, payload...) messages:
+    #   ("data", text, bytes_read)
+    #   ("done", bytes_read)
+    #   ("cancelled", bytes_read)
+    #   ("error", exception)
+    def __init__(self, path, encoding="utf-8", chunk_size=CHUNK_SIZE, first_chunk_size=FIRST_CHUNK_SIZE):
+        self.path = path
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.first_chunk_size = first_chunk_size
+        self.total_bytes = os.path.getsize(path)
+        self.newline_counts = dict.fromkeys(NEWLINES, 0)
+        self.results = queue.Queue(maxsize=MAX_PENDING_CHUNKS)
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="file-loader", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _put(self, message):
+        # Blocks while the queue is full, but gives up once the load is cancelled so the
+        # thread never hangs on a consumer that went away.
+        while True:
+            try:
+                self.results.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                if self.cancelled:
+                    return False
+
+    @property
+    def newline(self):
+        # The file's most common line ending so far ("\n" if it has none). A file that
+        # mixes styles is written back with this one throughout.
+        return max(NEWLINES, key=self.newline_counts.get)
+
+    def iter_chunks(self):
+        # Yields (text, bytes_read) synchronously; also usable without Tk.
+        # The decoder holds back a trailing \r until the next chunk even when it does not
+        # translate, so a \r\n pair is never split between two chunks.
+        decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder(self.encoding)(), translate=False)
+        bytes_read = 0
+        size = self.first_chunk_size
+        with open(self.path, "rb") as f:
+            while True:
+                data = f.read(size)
+                size = self.chunk_size
+                bytes_read += len(data)
+                instrumentation.count("bytes_read", len(data))
+                text = decoder.decode(data, final=not data)
+                if text:
+                    yield self._translate_newlines(text), bytes_read
+                if not data:
+                    return
+
+    def _translate_newlines(self, text):
+        crlf = text.count("\r\n")
+        cr = text.count("\r") - crlf
+        self.newline_counts["\r\n"] += crlf
+        self.newline_counts["\r"] += cr
+        self.newline_counts["\n"] += text.count("\n") - crlf
+        if crlf:
+            text = text.replace("\r\n", "\n")
+        if cr:
+            text = text.replace("\r", "\n")
+        return text
+
+    def run(self):
+        bytes_read = 0
+        try:
+            for text, bytes_read in self.iter_chunks():
+                if self.cancelled or not self._put(("data", text, bytes_read)):
+                    self._put(("cancelled", bytes_read))
+                    return
+            self._put(("done", bytes_read))
+        except Exception as e:
+            self._put(("error", e))
+
+
+def atomic_write(path, chunks, encoding="utf-8", fsync="file", buffer_size=CHUNK_SIZE, newline=None):
+    # Writes an iterable of text chunks to path via a temporary file in the same
+    # directory and os.replace, so a crash leaves either the old file or the complete
+    # new one, never a half-written file. Each \n is written as `newline` (one of
+    # NEWLINES; None means os.linesep, as for open()). Returns the number of bytes written.
+    if fsync not in FSYNC_POLICIES:
+        raise ValueError(f"Unknown fsync policy: {fsync}")
+    path = os.path.abspath(path)
+    directory = os.path.dirname(path)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with open(fd, "w", encoding=encoding, buffering=buffer_size, newline=newline) as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            if fsync != "none":
+                os.fsync(f.fileno())
+            bytes_written = os.fstat(f.fileno()).st_size
+        instrumentation.count("bytes_written", bytes_written)
+        # mkstemp creates the file private to the user; keep the permissions of the file
+        # being replaced, or the usual defaults for a new file.
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(temp_path, 0o666 & ~umask)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == "full" and hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return bytes_written
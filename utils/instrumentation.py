@@ -0,0 +1,180 @@
+import atexit
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+# Callbacks receiving every timing event (a dict with at least "name" and "seconds").
+# Set TEXTEDITOR_TIMING=1 to print events to the console, and TEXTEDITOR_TRACE=<path>
+# to append them to a JSON-lines trace file (see open_trace).
+_listeners = []
+
+# The last events are kept for the Diagnostics window and trace dumps.
+MAX_RECENT_EVENTS = 1000
+_recent_events = deque(maxlen=MAX_RECENT_EVENTS)
+
+# Running totals such as words checked, tags added and bytes read. count() may be
+# called from worker threads.
+_counters = Counter()
+_counters_lock = threading.Lock()
+
+# cProfile.Profile while profiling is on (see start_profiling)
+_profiler = None
+
+
+def add_listener(callback):
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def peak_rss_bytes():
+    # High-water mark of the process's resident memory, or None where unsupported.
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024 # Linux reports KiB
+
+
+def count(name, amount=1):
+    with _counters_lock:
+        _counters[name] += amount
+
+
+def counters():
+    with _counters_lock:
+        return dict(_counters)
+
+
+def recent_events():
+    return list(_recent_events)
+
+
+def reset():
+    # Clears the counters and the recent events (not the listeners).
+    with _counters_lock:
+        _counters.clear()
+    _recent_events.clear()
+
+
+def record(name, seconds, **fields):
+    event = {"name": name, "seconds": seconds, "time": time.time(),
+             "thread": threading.current_thread().name, "peak_rss": peak_rss_bytes()}
+    event.update(fields)
+    _recent_events.append(event)
+    for callback in list(_listeners):
+        callback(event)
+    return event
+
+
+@contextmanager
+def timed(name, trace_memory=False, **fields):
+    # Times the block and reports it through record(). The block may add fields to the
+    # yielded dict (e.g. bytes written). With trace_memory, the peak of Python
+    # allocations made inside the block is reported as "peak_alloc".
+    started_tracing = False
+    if trace_memory:
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_tracing = True
+    start = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        seconds = time.perf_counter() - start
+        if trace_memory:
+            fields["peak_alloc"] = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+        record(name, seconds, **fields)
+
+
+def instrument(name, func):
+    # Wraps a command handler so every call is reported as a "command:<name>" event.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with timed(f"command:{name}"):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def start_profiling():
+    # Profiles the calling thread (the Tk main loop) until stop_profiling. Work done on
+    # the background threads shows up in the spans and counters instead.
+    global _profiler
+    if _profiler is None:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def profiling_active():
+    return _profiler is not None
+
+
+def stop_profiling(path=None, limit=40):
+    # Stops profiling and returns the top `limit` functions by cumulative time as text.
+    # With path, the raw stats are also saved for pstats/snakeviz.
+    global _profiler
+    if _profiler is None:
+        return ""
+    profiler, _profiler = _profiler, None
+    profiler.disable()
+    if path:
+        profiler.dump_stats(path)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+
+def dump_trace(path):
+    # Writes the recent events and the counters to path as one JSON document.
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"events": recent_events(), "counters": counters()}, f, indent=2, default=str)
+
+
+def open_trace(path):
+    # Appends every event to path as a JSON line from now on; the counters are written
+    # as a final "counters" line when the process exits.
+    trace_file = open(path, "a", encoding="utf-8", buffering=1)
+    lock = threading.Lock()
+
+    def write_event(event):
+        with lock:
+            trace_file.write(json.dumps(event, default=str) + "\n")
+
+    def close():
+        remove_listener(write_event)
+        write_event({"name": "counters", "seconds": 0, "time": time.time(), "counters": counters()})
+        trace_file.close()
+
+    add_listener(write_event)
+    atexit.register(close)
+
+
+def print_event(event):
+    details = ", ".join(f"{key}={value}" for key, value in event.items() if key not in ("name", "seconds", "time", "thread"))
+    print(f"[timing] {event['name']}: {event['seconds']:.3f}s ({details})")
+
+
+if os.environ.get("TEXTEDITOR_TIMING"):
+    add_listener(print_event)
+if os.environ.get("TEXTEDITOR_TRACE"):
+    open_trace(os.environ["TEXTEDITOR_TRACE"])
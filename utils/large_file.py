@@ -0,0 +1,96 @@
+import bisect
+import mmap
+import os
+import threading
+from array import array
+from utils import instrumentation
+
+# Byte block size of the sparse line index. Only the number of newlines before each
+# block is stored, so the index of a multi-GB file holds tens of thousands of integers
+# instead of one offset per line. Finding a line scans at most one block.
+INDEX_BLOCK_SIZE = 64 * 1024
+
+
+class MappedTextFile:
+    # Read-only, memory-mapped view of a text file with a sparse line index. The index
+    # is built by build_index (optionally on a background thread via start_indexing);
+    # lines already covered by the index can be read while it is still being built.
+    def __init__(self, path, encoding="utf-8", block_size=INDEX_BLOCK_SIZE):
+        self.path = path
+        self.encoding = encoding
+        self.block_size = block_size
+        self._file = open(path, "rb")
+        self.size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files; an empty file simply has no bytes to map.
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b""
+        self._newlines_before = array("Q", [0]) # Newlines before block i (one entry per indexed block + 1)
+        self.indexed_bytes = 0
+        self.index_complete = threading.Event()
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start_indexing(self):
+        self._thread = threading.Thread(target=self.build_index, name="line-index", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel_indexing(self):
+        self._cancel_event.set()
+
+    def build_index(self):
+        block = len(self._newlines_before) - 1
+        while block * self.block_size < self.size:
+            if self._cancel_event.is_set():
+                return
+            start = block * self.block_size
+            end = min(start + self.block_size, self.size)
+            self._newlines_before.append(self._newlines_before[-1] + self._map[start:end].count(b"\n"))
+            self.indexed_bytes = end
+            block += 1
+        self.index_complete.set()
+
+    def line_count(self):
+        # Lines known so far. Once indexing is complete this is the number of lines in the
+        # file, counting a final line without a trailing newline.
+        newlines = self._newlines_before[-1]
+        if self.index_complete.is_set() and self.size and self._map[self.size - 1:self.size] != b"\n":
+            return newlines + 1
+        return max(newlines, 1)
+
+    def line_offset(self, line):
+        # Byte offset of the start of `line` (0-based). Lines past the indexed part map
+        # to the end of the indexed bytes.
+        if line <= 0:
+            return 0
+        newlines_before = self._newlines_before
+        if line > newlines_before[-1]:
+            return self.indexed_bytes
+        # Block b holds the line-th newline when newlines_before[b] < line <= newlines_before[b + 1]
+        block = bisect.bisect_left(newlines_before, line) - 1
+        start = block * self.block_size
+        data = self._map[start:min(start + self.block_size, self.size)]
+        skip = line - newlines_before[block] # That newline is the skip-th one in this block
+        newline_at = len(data) - len(data.split(b"\n", skip)[-1]) - 1
+        return start + newline_at + 1
+
+    def read_lines(self, first, count):
+        # Text of lines [first, first + count), decoded leniently so a window that starts
+        # mid-way through a malformed region still displays.
+        known_newlines = self._newlines_before[-1]
+        if first + count <= known_newlines:
+            end = self.line_offset(first + count)
+        elif self.index_complete.is_set():
+            end = self.size
+        else: # Stop at the last line the index has fully seen
+            end = self.line_offset(known_newlines)
+        start = min(self.line_offset(first), end)
+        instrumentation.count("bytes_read", end - start)
+        return self._map[start:end].decode(self.encoding, errors="replace").replace("\r\n", "\n")
+
+    def close(self):
+        self.cancel_indexing()
+        if self._thread is not None:
+            self._thread.join()
+        if self.size:
+            self._map.close()
+        self._file.close()
@@ -0,0 +1,16 @@
+def iter_match_positions(pattern, content, start_line=1):
+    # Yields (match, line, column) for every match of the compiled pattern in content.
+    # Lines and columns use Tk's conventions (lines from start_line, columns from 0),
+    # so f"{line}.{column}" is a valid text widget index when content came from
+    # text_area.get(f"{start_line}.0", ...). Matches must not span lines.
+    line = start_line
+    line_start = 0  # Offset in content of the first character of `line`
+    scanned = 0     # Offset up to which newlines have been counted
+    for match in pattern.finditer(content):
+        start = match.start()
+        newlines = content.count("\n", scanned, start)
+        if newlines:
+            line += newlines
+            line_start = content.rfind("\n", scanned, start) + 1
+        scanned = start
+        yield match, line, start - line_start
@@ -0,0 +1,191 @@
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from utils.positions import iter_match_positions
+from utils.dictionary_cache import load_dictionary, UserDictionary
+from utils import instrumentation
+from utils.tokenizers import mask_non_prose
+
+# Number of suggestion lists kept for the session. Candidate generation (edit distance
+# 1 and 2 against the dictionary) is the most expensive part of spell checking, so lists
+# are only computed for words that are about to be shown and are then reused.
+DEFAULT_SUGGESTION_CACHE_SIZE = 2048
+
+# A "word" is a run of letters/digits, optionally joined by apostrophes (don't, o'clock).
+# Underscores are excluded so that, like str.isalnum(), foo_bar splits into two words.
+# Because the pattern is greedy, every match is already a whole word: the characters
+# on either side of it are never alphanumeric.
+WORD_PATTERN = re.compile(r"[^\W_]+(?:['’][^\W_]+)*")
+
+
+def iter_word_positions(content, start_line=1):
+    # Yields (word, line, column) for every word in content, in document order.
+    # See iter_match_positions for the line/column conventions.
+    for match, line, column in iter_match_positions(WORD_PATTERN, content, start_line):
+        yield match.group(), line, column
+
+
+class SuggestionCache:
+    # Bounded LRU cache of word -> suggestion list. Safe to share between the Tk thread
+    # and the prefetch thread.
+    def __init__(self, maxsize=DEFAULT_SUGGESTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, word):
+        # Membership test that does not count as a hit or miss, nor refresh recency.
+        with self._lock:
+            return word in self._entries
+
+    def get(self, word):
+        with self._lock:
+            suggestions = self._entries.get(word)
+            if suggestions is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(word)
+            self.hits += 1
+            return suggestions
+
+    def put(self, word, suggestions):
+        with self._lock:
+            self._entries[word] = suggestions
+            self._entries.move_to_end(word)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def info(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+
+
+def normalize_word(word):
+    # Dictionary key for a word as written: lower case, typographic apostrophes as '.
+    return word.lower().replace("’", "'")
+
+
+class SpellCheckerUtil:
+    def __init__(self, language="en", suggestion_cache_size=DEFAULT_SUGGESTION_CACHE_SIZE,
+                 cache_dir=None, user_dictionary_path=None):
+        # Memory-mapped, compiled from pyspellchecker's word list on first use and reused
+        # across launches (see utils/dictionary_cache.py).
+        self.dictionary = load_dictionary(language, cache_dir)
+        self.user_dictionary = UserDictionary(user_dictionary_path) # "Add to Dictionary", persistent
+        self.ignored_words = set() # "Ignore All", for this session only
+        # Lives as long as this object, i.e. across spell-check runs in the same session.
+        self.suggestion_cache = SuggestionCache(suggestion_cache_size)
+        self._prefetcher = None # Single worker thread, created on first prefetch
+        self._pending = {}      # word -> Future for suggestions being prefetched
+        self._pending_lock = threading.Lock()
+
+    def is_misspelled(self, word):
+        # Numbers, version strings and the like are not spell checked.
+        if any(char.isdigit() for char in word):
+            return False
+        key = normalize_word(word)
+        return key not in self.ignored_words and key not in self.user_dictionary and key not in self.dictionary
+
+    def add_to_dictionary(self, word):
+        self.user_dictionary.add(normalize_word(word))
+
+    def ignore_word(self, word):
+        self.ignored_words.add(normalize_word(word))
+
+    def get_suggestions(self, word):
+        suggestions = self.suggestion_cache.get(word)
+        if suggestions is not None:
+            return suggestions
+        with self._pending_lock:
+            future = self._pending.get(word)
+        if future is not None: # Already being prefetched, wait for it instead of duplicating work
+            return future.result()
+        suggestions = self._compute_suggestions(word)
+        self.suggestion_cache.put(word, suggestions)
+        return suggestions
+
+    def prefetch_suggestions(self, words):
+        # Computes suggestions for the given words on a background thread so they are
+        # cached by the time they are shown.
+        with self._pending_lock:
+            for word in words:
+                if word in self._pending or word in self.suggestion_cache:
+                    continue
+                if self._prefetcher is None:
+                    self._prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="suggestions")
+                self._pending[word] = self._prefetcher.submit(self._prefetch_one, word)
+
+    def _prefetch_one(self, word):
+        try:
+            suggestions = self._compute_suggestions(word)
+            self.suggestion_cache.put(word, suggestions)
+            return suggestions
+        finally:
+            with self._pending_lock:
+                self._pending.pop(word, None)
+
+    def suggestion_cache_info(self):
+        return self.suggestion_cache.info()
+
+    def _compute_suggestions(self, word):
+        # Same candidate rules as pyspellchecker: known words one edit away, or failing
+        # that two edits away, looked up in the compiled dictionary.
+        instrumentation.count("suggestions_computed")
+        key = normalize_word(word)
+        frequencies = self._known(self._edits1(key))
+        if not frequencies:
+            frequencies = self._known(edit for first in self._edits1(key) for edit in self._edits1(first))
+        frequencies.pop(key, None)
+        # Most frequent first; ties broken alphabetically so the order is stable.
+        suggestions = sorted(frequencies, key=lambda w: (-frequencies[w], w))
+        if word[:1].isupper():
+            suggestions = [s[:1].upper() + s[1:] for s in suggestions]
+        return suggestions
+
+    def _known(self, words):
+        # {word: frequency} for the given candidates that are in the dictionary
+        known = {}
+        for word in set(words):
+            frequency = self.dictionary.frequency(word)
+            if frequency:
+                known[word] = frequency
+        return known
+
+    def _edits1(self, word):
+        letters = self.dictionary.letters
+        splits = [(word[:i], word[i:]) for i in range(len(word) + 1)]
+        deletes = [left + right[1:] for left, right in splits if right]
+        transposes = [left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1]
+        replaces = [left + c + right[1:] for left, right in splits if right for c in letters]
+        inserts = [left + c + right for left, right in splits for c in letters]
+        return set(deletes + transposes + replaces + inserts)
+
+    def scan_misspellings(self, content, start_line=1, verdicts=None, tokenizer=None):
+        # Single pass over content: yields (word, line, column) for every misspelled
+        # occurrence, in document order. Each distinct word is looked up only once;
+        # pass the same verdicts dict to share lookups across several calls. With a
+        # tokenizer (see utils/tokenizers.py) only its prose spans are checked.
+        if verdicts is None:
+            verdicts = {}
+        content = mask_non_prose(content, tokenizer)
+        checked = lookups = 0
+        try:
+            for word, line, column in iter_word_positions(content, start_line):
+                checked += 1
+                misspelled = verdicts.get(word)
+                if misspelled is None:
+                    lookups += 1
+                    misspelled = verdicts[word] = self.is_misspelled(word)
+                if misspelled:
+                    yield word, line, column
+        finally: # Counted once per call, not per word
+            instrumentation.count("words_checked", checked)
+            instrumentation.count("dictionary_lookups", lookups)
@@ -0,0 +1,107 @@
+import queue
+import threading
+from utils import instrumentation
+from utils.tokenizers import mask_non_prose
+
+# Number of lines handed to the checker at a time. Results are posted once per chunk,
+# so this also controls how often highlights appear in the editor.
+DEFAULT_CHUNK_LINES = 500
+
+
+def iter_line_chunks(content, chunk_lines=DEFAULT_CHUNK_LINES, start_line=1):
+    # Yields (first_line, text) for consecutive blocks of at most chunk_lines lines.
+    # Each block keeps its trailing newline so line numbers stay aligned.
+    pos = 0
+    line = start_line
+    while pos < len(content):
+        end = pos
+        for _ in range(chunk_lines):
+            end = content.find("\n", end) + 1
+            if end == 0: # No more newlines, the rest is the last (partial) line
+                end = len(content)
+                break
+        yield line, content[pos:end]
+        line += chunk_lines
+        pos = end
+
+
+class SpellCheckJob:
+    # Runs the dictionary lookups for one document snapshot, either on a background
+    # thread (start) or synchronously (run). Suggestions are not generated here; the
+    # editor asks SpellCheckerUtil.get_suggestions for a word when it is about to show it.
+    # With a tokenizer, the whole document is reduced to its prose before it is split
+    # into chunks, so structure spanning a chunk boundary (e.g. a <script>) is respected.
+    #
+    # Results are posted to `self.results` as (kind, payload) messages:
+    #   ("chunk", [{"word", "start", "end"}, ...])  one per chunk with hits
+    #   ("done", total_occurrences)
+    #   ("cancelled", occurrences_so_far)
+    #   ("error", exception)
+    def __init__(self, spell_checker_util, content, chunk_lines=DEFAULT_CHUNK_LINES, tokenizer=None):
+        self.spell_checker_util = spell_checker_util
+        self.content = content
+        self.chunk_lines = chunk_lines
+        self.tokenizer = tokenizer
+        self.results = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="spell-check", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self):
+        util = self.spell_checker_util
+        verdicts = {} # Shared across chunks so each distinct word is looked up once
+        total = 0
+        try:
+            with instrumentation.timed("spell_check.scan", characters=len(self.content)) as fields:
+                content = mask_non_prose(self.content, self.tokenizer)
+                for first_line, text in iter_line_chunks(content, self.chunk_lines):
+                    if self.cancelled:
+                        fields["cancelled"] = True
+                        self.results.put(("cancelled", total))
+                        return
+                    items = []
+                    for word, line, char in util.scan_misspellings(text, first_line, verdicts):
+                        items.append({
+                            "word": word,
+                            "start": f"{line}.{char}",
+                            "end": f"{line}.{char + len(word)}"
+                        })
+                    if items:
+                        total += len(items)
+                        self.results.put(("chunk", items))
+                fields["occurrences"] = total
+            self.results.put(("done", total))
+        except Exception as e:
+            self.results.put(("error", e))
+
+
+def check_text(content, spell_checker_util=None, chunk_lines=DEFAULT_CHUNK_LINES, tokenizer=None):
+    # Headless entry point (no Tk needed): runs a job synchronously and returns the
+    # occurrence list the editor would build, in document order.
+    if spell_checker_util is None:
+        from utils.spell_checker import SpellCheckerUtil
+        spell_checker_util = SpellCheckerUtil()
+    job = SpellCheckJob(spell_checker_util, content, chunk_lines, tokenizer)
+    job.run()
+    occurrences = []
+    while not job.results.empty():
+        kind, payload = job.results.get_nowait()
+        if kind == "chunk":
+            occurrences.extend(payload)
+        elif kind == "error":
+            raise payload
+    return occurrences
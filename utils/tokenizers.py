@@ -0,0 +1,261 @@
+import html
+import os
+import re
+from html.parser import HTMLParser
+
+# A tokenizer takes a document's text and yields (start, end) offsets of its prose: the
+# parts worth spell checking. Everything else (markup, JSON syntax and keys, URLs,
+# encoded blobs) is never looked up, which saves a dictionary lookup per token and
+# keeps false "misspellings" out of the results.
+#
+# mask_non_prose turns a tokenizer's output back into a string of the same length and
+# line structure with everything but the prose blanked out, so the line/column
+# positions found by scan_misspellings still point into the original text. mask_window
+# does the same for a few lines cut out of a document (see WINDOW_CONTEXT).
+#
+# A word written with an escaped letter (caf\u00e9, caf&eacute;) is left out as a whole:
+# its halves are not words, and checking them would only report false misspellings.
+
+# Tokens inside prose that are not words: links, e-mail addresses, and long runs of
+# base64/hex such as data: URIs, hashes and keys.
+NOISE_PATTERN = re.compile(
+    r"(?:https?|ftp|file)://\S+|www\.\S+"
+    r"|[\w.+-]+@[\w-]+\.[\w.-]+"
+    r"|(?P<blob>[A-Za-z0-9+/_-]{32,}={0,2})"
+)
+# A long "blob" run may just as well be hyphenated prose (state-of-the-art-...); it only
+# counts as encoded data if it has a digit, + or /, or a capital letter inside a word.
+_ENCODED_HINT = re.compile(r"[0-9+/]|[a-z][A-Z]")
+_LINE_BREAK = re.compile(r"\n")
+
+
+def text_prose_spans(content, start=0, end=None):
+    # content[start:end] minus the NOISE_PATTERN matches
+    end = len(content) if end is None else end
+    position = start
+    for match in NOISE_PATTERN.finditer(content, start, end):
+        if match.lastgroup == "blob" and not _ENCODED_HINT.search(match.group()):
+            continue
+        if match.start() > position:
+            yield position, match.start()
+        position = match.end()
+    if position < end:
+        yield position, end
+
+
+def _word_start(content, start, position):
+    # Start of the run of letters/digits ending at position, but not before start
+    while position > start and content[position - 1].isalnum():
+        position -= 1
+    return position
+
+
+def _word_end(content, position, end):
+    # End of the run of letters/digits starting at position, but not past end
+    while position < end and content[position].isalnum():
+        position += 1
+    return position
+
+
+class _HTMLTextScanner(HTMLParser):
+    # Collects the offsets of text nodes outside <script> and <style>. Character
+    # references are left out of the spans (convert_charrefs=False keeps the data
+    # passed to handle_data identical to the source text, so offsets stay exact), and
+    # the offsets where references to letters start and end are noted.
+    SKIPPED_ELEMENTS = ("script", "style")
+
+    def __init__(self, content):
+        super().__init__(convert_charrefs=False)
+        self.content = content
+        self.line_starts = [0] + [match.end() for match in _LINE_BREAK.finditer(content)]
+        self.spans = []
+        self.letter_ref_starts = set()
+        self.letter_ref_ends = set()
+        self._skipped_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIPPED_ELEMENTS:
+            self._skipped_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIPPED_ELEMENTS and self._skipped_depth:
+            self._skipped_depth -= 1
+
+    def _offset(self):
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_data(self, data):
+        if self._skipped_depth or data.isspace():
+            return
+        start = self._offset()
+        self.spans.append((start, start + len(data)))
+
+    def handle_entityref(self, name):
+        self._handle_ref(len(name) + 1)
+
+    def handle_charref(self, name):
+        self._handle_ref(len(name) + 2)
+
+    def _handle_ref(self, length):
+        # length of the reference without its optional closing ";"
+        start = self._offset()
+        end = start + length
+        if self.content.startswith(";", end):
+            end += 1
+        if html.unescape(self.content[start:end]).isalpha():
+            self.letter_ref_starts.add(start)
+            self.letter_ref_ends.add(end)
+
+
+def html_prose_spans(content):
+    scanner = _HTMLTextScanner(content)
+    scanner.feed(content)
+    scanner.close()
+    # HTMLParser hands an unfinished tag or comment at the very end over as text
+    unfinished = _html_open_construct(content)
+    limit = len(content) if unfinished is None else unfinished[0]
+    for start, end in scanner.spans:
+        end = min(end, limit)
+        if start in scanner.letter_ref_ends:
+            start = _word_end(content, start, end)
+        if end in scanner.letter_ref_starts:
+            end = _word_start(content, start, end)
+        if start < end:
+            yield from text_prose_spans(content, start, end)
+
+
+# Where an HTML comment, raw-text element or tag starts, and what ends it
+_HTML_COMMENT_START = "<!--"
+_HTML_COMMENT_END = re.compile(r"-->")
+_HTML_RAW_START = re.compile(r"<(script|style)\b", re.IGNORECASE)
+_HTML_RAW_END = re.compile(r"</(script|style)\b", re.IGNORECASE)
+_HTML_TAG_START = re.compile(r"<[a-zA-Z/!?]")
+_HTML_TAG_END = re.compile(r">")
+
+
+def _last_match(pattern, text):
+    match = None
+    for match in pattern.finditer(text):
+        pass
+    return match
+
+
+def _html_open_construct(text):
+    # (offset, end pattern) of the comment, <script>/<style> element or tag that is
+    # still open at the end of text, or None if text ends in ordinary content. Checked
+    # outermost first, since "<" and ">" mean nothing inside a comment or a script.
+    comment_start = text.rfind(_HTML_COMMENT_START)
+    if comment_start >= 0 and not _HTML_COMMENT_END.search(text, comment_start + len(_HTML_COMMENT_START)):
+        return comment_start, _HTML_COMMENT_END
+    raw_start = _last_match(_HTML_RAW_START, text)
+    if raw_start is not None:
+        raw_end = _HTML_RAW_END.search(text, raw_start.end())
+        if raw_end is None:
+            return raw_start.start(), re.compile(rf"</{raw_start.group(1)}\s*>", re.IGNORECASE)
+    tag_start = _last_match(_HTML_TAG_START, text)
+    if tag_start is not None and not _HTML_TAG_END.search(text, tag_start.end()):
+        return tag_start.start(), _HTML_TAG_END
+    return None
+
+
+def html_window_context(before, window, after):
+    # The end of `before` and the start of `after` that a comment, element or tag
+    # crossing the window's edges needs, so the window is read as in a full scan.
+    construct = _html_open_construct(before)
+    prefix = before[construct[0]:] if construct else ""
+    construct = _html_open_construct(prefix + window)
+    suffix = ""
+    if construct:
+        end = construct[1].search(after)
+        suffix = after[:end.end()] if end else after
+    return prefix, suffix
+
+
+# A JSON string; group 1 is its contents. Escapes are matched as a unit so an escaped
+# quote does not end the string.
+_JSON_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+_JSON_ESCAPE = re.compile(r'\\(?:u[0-9a-fA-F]{4}|.)')
+_JSON_KEY_FOLLOWS = re.compile(r"\s*:")
+
+
+def json_prose_spans(content):
+    # String values (not keys) of a JSON document, scanned lazily from start to end
+    # without building the parsed object. Escape sequences are left out of the spans,
+    # together with the rest of the word when they stand for a letter.
+    for match in _JSON_STRING.finditer(content):
+        if _JSON_KEY_FOLLOWS.match(content, match.end()):
+            continue
+        position, end = match.start(1), match.end(1)
+        for escape in _JSON_ESCAPE.finditer(content, position, end):
+            stop, resume = escape.start(), escape.end()
+            if escape.group().startswith("\\u") and chr(int(escape.group()[2:], 16)).isalpha():
+                stop = _word_start(content, position, stop)
+                resume = _word_end(content, resume, end)
+            yield from text_prose_spans(content, position, stop)
+            position = resume
+        yield from text_prose_spans(content, position, end)
+
+
+TOKENIZERS = {
+    "text": text_prose_spans,
+    "html": html_prose_spans,
+    "json": json_prose_spans,
+}
+
+# File extension -> TOKENIZERS key. Other files are checked as they are.
+EXTENSIONS = {
+    ".txt": "text",
+    ".md": "text",
+    ".html": "html",
+    ".htm": "html",
+    ".xhtml": "html",
+    ".json": "json",
+}
+
+
+# Tokenizers whose reading of a line depends on the lines around it, and the function
+# that picks the surrounding text they need: (before, window, after) -> (prefix, suffix).
+# Plain text and JSON (whose strings cannot span lines) need none.
+WINDOW_CONTEXT = {
+    html_prose_spans: html_window_context,
+}
+
+
+def tokenizer_for_path(path):
+    # The tokenizer for a file name, or None to check the whole text.
+    if not path:
+        return None
+    name = EXTENSIONS.get(os.path.splitext(path)[1].lower())
+    return TOKENIZERS[name] if name else None
+
+
+def mask_non_prose(content, tokenizer):
+    # content with every character outside the tokenizer's spans replaced by a space,
+    # except line breaks, so lengths and line/column positions are unchanged.
+    if tokenizer is None:
+        return content
+    pieces = []
+    position = 0
+    for start, end in tokenizer(content):
+        if start > position:
+            pieces.append(_blank(content[position:start]))
+        pieces.append(content[start:end])
+        position = end
+    pieces.append(_blank(content[position:]))
+    return "".join(pieces)
+
+
+def mask_window(window, tokenizer, before="", after=""):
+    # mask_non_prose for a window of whole lines cut out of a longer document, given
+    # (some of) the text before and after it.
+    context = WINDOW_CONTEXT.get(tokenizer)
+    if context is None:
+        return mask_non_prose(window, tokenizer)
+    prefix, suffix = context(before, window, after)
+    masked = mask_non_prose(prefix + window + suffix, tokenizer)
+    return masked[len(prefix):len(prefix) + len(window)]
+
+
+def _blank(text):
+    return "\n".join(" " * len(part) for part in text.split("\n"))
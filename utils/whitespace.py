@@ -0,0 +1,36 @@
+import re
+from utils.positions import iter_match_positions
+
+# Runs of consecutive spaces; a run is tagged (or deleted) as one range.
+SPACE_RUN_PATTERN = re.compile(r" +")
+
+# Kinds of whitespace the deletion commands can remove. None of them matches a line
+# break, so deleting runs never changes line numbers.
+WHITESPACE_PATTERNS = {
+    "spaces": SPACE_RUN_PATTERN,
+    "tabs": re.compile(r"\t+"),
+    "nbsp": re.compile("[\u00a0\u2007\u202f]+"), # No-break spaces (plain, figure, narrow)
+    "all": re.compile(r"[^\S\n]+"), # Any whitespace except line breaks
+    "trailing": re.compile(r"[^\S\n]+$", re.MULTILINE), # Whitespace at the end of a line
+}
+
+
+def iter_space_runs(content, start_line=1, pattern=SPACE_RUN_PATTERN):
+    # Yields (line, start_column, end_column) for every whitespace run in content.
+    for match, line, column in iter_match_positions(pattern, content, start_line):
+        yield line, column, column + (match.end() - match.start())
+
+
+def find_whitespace_runs(content, mode="spaces", start_line=1):
+    # All runs of the given kind of whitespace in one pass, in document order.
+    return list(iter_space_runs(content, start_line, WHITESPACE_PATTERNS[mode]))
+
+
+def delete_runs(content, runs, start_line=1):
+    # Returns content with the given runs removed; the string counterpart of deleting
+    # them from the widget, for use without Tk.
+    lines = content.split("\n")
+    for line, start, end in reversed(runs):
+        i = line - start_line
+        lines[i] = lines[i][:start] + lines[i][end:]
+    return "\n".join(lines)